@@ -1,15 +1,26 @@
 """
 Redis cache client for the Sonicus application.
 """
-import json
 import logging
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+import orjson
 import redis
 from redis.exceptions import AuthenticationError, ConnectionError, RedisError
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# orjson options for cached JSON values; anything orjson cannot encode falls back to str()
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+# Deletes KEYS[1] only while it still holds ARGV[1], so a lock is released by its owner only
+COMPARE_AND_DELETE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
 class RedisClient:
     """Redis client for caching operations"""
     
@@ -95,6 +106,16 @@ class RedisClient:
             logger.error(f"Redis set error: {str(e)}")
             return False
     
+    def set_nx(self, key: str, value: str, expire: Optional[int] = None) -> Optional[bool]:
+        """Set a value only if the key does not exist; None if Redis is unavailable"""
+        try:
+            if not self.client:
+                return None
+            return bool(self.client.set(key, value, ex=expire, nx=True))
+        except Exception as e:
+            logger.error(f"Redis set_nx error: {str(e)}")
+            return None
+    
     def get_json(self, key: str) -> Optional[Union[Dict[str, Any], list]]:
         """Get a JSON value from Redis cache"""
         try:
@@ -102,27 +123,57 @@ class RedisClient:
                 return None
             data = self.client.get(key)
             if data:
-                return json.loads(str(data))
+                return orjson.loads(data)
             return None
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error(f"Failed to decode JSON from Redis for key: {key}")
             return None
         except Exception as e:
             logger.error(f"Redis get_json error: {str(e)}")
             return None
     
+    def get_json_many(self, keys: List[str]) -> List[Optional[Union[Dict[str, Any], list]]]:
+        """Get several JSON values with a single MGET, in key order (None when missing)"""
+        try:
+            if not self.client or not keys:
+                return [None] * len(keys)
+            values = []
+            for key, data in zip(keys, self.client.mget(keys)):
+                try:
+                    values.append(orjson.loads(data) if data else None)
+                except orjson.JSONDecodeError:
+                    logger.error(f"Failed to decode JSON from Redis for key: {key}")
+                    values.append(None)
+            return values
+        except Exception as e:
+            logger.error(f"Redis get_json_many error: {str(e)}")
+            return [None] * len(keys)
+    
     def set_json(self, key: str, value: Union[Dict[str, Any], list], expire: Optional[int] = None) -> bool:
         """Set a JSON value in Redis cache with optional expiration in seconds"""
         try:
             if not self.client:
                 return False
-            json_data = json.dumps(value, default=str)
+            json_data = orjson.dumps(value, default=str, option=JSON_OPTIONS)
             result = self.client.set(key, json_data, ex=expire)
             return bool(result)
         except Exception as e:
             logger.error(f"Redis set_json error: {str(e)}")
             return False
     
+    def set_json_many(self, items: Dict[str, Tuple[Union[Dict[str, Any], list], Optional[int]]]) -> bool:
+        """Set several JSON values, each with its own expiration, in one pipelined round-trip"""
+        try:
+            if not self.client:
+                return False
+            pipe = self.client.pipeline(transaction=False)
+            for key, (value, expire) in items.items():
+                pipe.set(key, orjson.dumps(value, default=str, option=JSON_OPTIONS), ex=expire)
+            return all(pipe.execute())
+        except Exception as e:
+            logger.error(f"Redis set_json_many error: {str(e)}")
+            return False
+    
     def delete(self, key: str) -> bool:
         """Delete a key from Redis cache"""
         try:
@@ -134,5 +185,67 @@ class RedisClient:
             logger.error(f"Redis delete error: {str(e)}")
             return False
 
+    def delete_if_equals(self, key: str, value: str) -> bool:
+        """Delete a key only if it still holds the given value, atomically"""
+        try:
+            if not self.client:
+                return False
+            return bool(self.client.eval(COMPARE_AND_DELETE_SCRIPT, 1, key, value))
+        except Exception as e:
+            logger.error(f"Redis delete_if_equals error: {str(e)}")
+            return False
+
+    def unlink_many(self, keys: List[str]) -> int:
+        """Remove several keys with a single UNLINK, freeing memory in the background"""
+        try:
+            if not self.client or not keys:
+                return 0
+            return self.client.unlink(*keys)
+        except Exception as e:
+            logger.error(f"Redis unlink_many error: {str(e)}")
+            return 0
+    
+    def incr(self, key: str, expire: Optional[int] = None) -> Optional[int]:
+        """Atomically increment a counter, refreshing its expiration in the same round-trip"""
+        try:
+            if not self.client:
+                return None
+            pipe = self.client.pipeline(transaction=False)
+            pipe.incr(key)
+            if expire:
+                pipe.expire(key, expire)
+            return pipe.execute()[0]
+        except Exception as e:
+            logger.error(f"Redis incr error: {str(e)}")
+            return None
+    
+    def hincrby_many(self, key: str, increments: Dict[str, int]) -> bool:
+        """Increment several hash fields in a single pipelined round-trip"""
+        try:
+            if not self.client:
+                return False
+            pipe = self.client.pipeline(transaction=False)
+            for field, amount in increments.items():
+                pipe.hincrby(key, field, amount)
+            pipe.execute()
+            return True
+        except Exception as e:
+            logger.error(f"Redis hincrby error: {str(e)}")
+            return False
+    
+    def pop_hash(self, key: str) -> Optional[Dict[str, str]]:
+        """Atomically read and delete a hash, returning its fields"""
+        try:
+            if not self.client:
+                return None
+            pipe = self.client.pipeline(transaction=True)
+            pipe.hgetall(key)
+            pipe.delete(key)
+            fields, _ = pipe.execute()
+            return fields
+        except Exception as e:
+            logger.error(f"Redis pop_hash error: {str(e)}")
+            return None
+
 # Create a singleton Redis client instance for the application
 redis_client = RedisClient()
\ No newline at end of file
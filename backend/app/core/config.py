@@ -76,6 +76,9 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
     DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
     
+    # Organizations refreshed concurrently by the analytics refresh service
+    ANALYTICS_REFRESH_CONCURRENCY: int = int(os.getenv("ANALYTICS_REFRESH_CONCURRENCY", "4"))
+    
     # Development mode
     DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
     
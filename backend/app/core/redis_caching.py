@@ -16,7 +16,7 @@ import hashlib
 import pickle
 import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union, Callable
+from typing import Any, Dict, List, Optional, Tuple, Union, Callable
 from functools import wraps
 from dataclasses import dataclass
 import threading
@@ -232,6 +232,49 @@ class AdvancedRedisCache:
             self.stats.record_error()
             return None
     
+    def get_many(self, namespace: str, identifiers: List[str]) -> Dict[str, Any]:
+        """
+        Get several values from one namespace with a single Redis round-trip.
+        
+        Args:
+            namespace: Cache namespace
+            identifiers: Cache identifiers
+            
+        Returns:
+            Dict[str, Any]: Cached value per identifier (None if not found)
+        """
+        start_time = time.time()
+        
+        try:
+            cache_keys = [self.key_generator.generate(namespace, identifier) for identifier in identifiers]
+            cached_values = self.redis_client.get_json_many(cache_keys)
+            
+            response_time = time.time() - start_time
+            
+            values = {}
+            for identifier, cached_data in zip(identifiers, cached_values):
+                if cached_data is None:
+                    self.stats.record_miss(response_time)
+                    values[identifier] = None
+                elif isinstance(cached_data, dict) and "_cache_meta" in cached_data:
+                    if self._is_expired(cached_data["_cache_meta"]):
+                        self.delete(namespace, identifier)
+                        self.stats.record_miss(response_time)
+                        values[identifier] = None
+                    else:
+                        self.stats.record_hit(response_time)
+                        values[identifier] = cached_data["data"]
+                else:
+                    self.stats.record_hit(response_time)
+                    values[identifier] = cached_data
+            
+            return values
+            
+        except Exception as e:
+            logger.error(f"Cache get_many error for {namespace}: {e}")
+            self.stats.record_error()
+            return {identifier: None for identifier in identifiers}
+    
     def set(
         self, 
         namespace: str, 
@@ -256,18 +299,7 @@ class AdvancedRedisCache:
         try:
             cache_key = self.key_generator.generate(namespace, identifier, **kwargs)
             ttl = ttl or self.config.default_ttl
-            
-            # Wrap value with metadata
-            cache_data = {
-                "data": value,
-                "_cache_meta": {
-                    "created_at": datetime.utcnow().isoformat(),
-                    "ttl": ttl,
-                    "namespace": namespace,
-                    "identifier": str(identifier),
-                    "version": self.config.version
-                }
-            }
+            cache_data = self._wrap(namespace, identifier, value, ttl)
             
             success = self.redis_client.set_json(cache_key, cache_data, expire=ttl)
             
@@ -283,6 +315,52 @@ class AdvancedRedisCache:
             self.stats.record_error()
             return False
     
+    def set_many(self, namespace: str, entries: Dict[str, Tuple[Any, Optional[int]]]) -> bool:
+        """
+        Set several values in one namespace with a single Redis round-trip.
+        
+        Args:
+            namespace: Cache namespace
+            entries: Mapping of identifier to (value, ttl in seconds)
+            
+        Returns:
+            bool: Success status
+        """
+        try:
+            items = {}
+            for identifier, (value, ttl) in entries.items():
+                ttl = ttl or self.config.default_ttl
+                cache_key = self.key_generator.generate(namespace, identifier)
+                items[cache_key] = (self._wrap(namespace, identifier, value, ttl), ttl)
+            
+            success = self.redis_client.set_json_many(items)
+            
+            if success:
+                for _ in items:
+                    self.stats.record_set()
+            else:
+                self.stats.record_error()
+            
+            return success
+            
+        except Exception as e:
+            logger.error(f"Cache set_many error for {namespace}: {e}")
+            self.stats.record_error()
+            return False
+    
+    def _wrap(self, namespace: str, identifier: Union[str, Dict, List], value: Any, ttl: int) -> Dict[str, Any]:
+        """Wrap a value with cache metadata."""
+        return {
+            "data": value,
+            "_cache_meta": {
+                "created_at": datetime.utcnow().isoformat(),
+                "ttl": ttl,
+                "namespace": namespace,
+                "identifier": str(identifier),
+                "version": self.config.version
+            }
+        }
+    
     def delete(self, namespace: str, identifier: Union[str, Dict, List], **kwargs) -> bool:
         """
         Delete a value from cache.
@@ -309,6 +387,31 @@ class AdvancedRedisCache:
             self.stats.record_error()
             return False
     
+    def unlink_many(self, namespace: str, identifiers: List[str]) -> int:
+        """
+        Remove several values from one namespace with a single non-blocking UNLINK.
+        
+        Args:
+            namespace: Cache namespace
+            identifiers: Cache identifiers
+            
+        Returns:
+            int: Number of keys deleted
+        """
+        try:
+            cache_keys = [self.key_generator.generate(namespace, identifier) for identifier in identifiers]
+            deleted_count = self.redis_client.unlink_many(cache_keys)
+            
+            for _ in range(deleted_count):
+                self.stats.record_delete()
+            
+            return deleted_count
+            
+        except Exception as e:
+            logger.error(f"Cache unlink_many error for {namespace}: {e}")
+            self.stats.record_error()
+            return 0
+    
     def invalidate_namespace(self, namespace: str) -> int:
         """
         Invalidate all cache entries in a namespace.
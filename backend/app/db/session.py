@@ -3,6 +3,8 @@ Database session management.
 """
 import logging
 from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -45,6 +47,10 @@ engine = create_engine(
     connection_url,
     pool_size=settings.CONNECTION_POOL_SIZE,
     max_overflow=settings.MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,  # Drop connections the server closed while pooled
+    pool_use_lifo=True,  # Reuse warm connections so idle ones can be recycled
     echo=settings.SQL_ECHO
 )
 
@@ -61,6 +67,23 @@ def set_search_path(dbapi_connection, connection_record):
 # Create a session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine on asyncpg for code running on the event loop; asyncpg takes the
+# search_path as a server setting rather than a connect-time statement
+async_engine = create_async_engine(
+    make_url(connection_url).set(drivername="postgresql+asyncpg"),
+    pool_size=settings.CONNECTION_POOL_SIZE,
+    max_overflow=settings.MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    pool_use_lifo=True,
+    echo=settings.SQL_ECHO,
+    connect_args={"server_settings": {"search_path": f"{settings.POSTGRES_SCHEMA}, public"}}
+)
+
+# Create an async session factory
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 # Create a base class for declarative models
 Base = declarative_base()
 
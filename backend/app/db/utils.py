@@ -0,0 +1,32 @@
+"""
+Database maintenance helpers shared by services and background jobs.
+"""
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+# Rows deleted per transaction, keeping each DELETE short
+CLEANUP_BATCH_SIZE = 10000
+
+# Materialized view holding the dashboard aggregates (migrations/add_dashboard_snapshot_view.py)
+DASHBOARD_SNAPSHOT_VIEW = "mv_dashboard_snapshot"
+
+
+def delete_in_batches(db: Session, model, condition, batch_size: int = CLEANUP_BATCH_SIZE) -> int:
+    """Delete rows matching condition in batches, committing after each one."""
+    total_deleted = 0
+    while True:
+        batch_ids = db.query(model.id).filter(condition).limit(batch_size).subquery()
+        deleted = db.query(model).filter(
+            model.id.in_(select(batch_ids.c.id))
+        ).delete(synchronize_session=False)
+        db.commit()
+
+        total_deleted += deleted
+        if deleted < batch_size:
+            return total_deleted
+
+
+def refresh_materialized_view(db: Session, view_name: str):
+    """Refresh a materialized view concurrently, so readers are never blocked, and commit."""
+    db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view_name}"))
+    db.commit()
@@ -4,7 +4,7 @@ Organization Analytics Cache Model
 Caches computed analytics for performance optimization.
 """
 
-from sqlalchemy import Column, String, DateTime, Float, Integer, JSON, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Float, Integer, JSON, ForeignKey, Text, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -50,6 +50,16 @@ class OrganizationAnalyticsCache(Base):
     
     # Relationships
     # organization = relationship("Organization", back_populates="analytics_cache")  # Temporarily disabled to fix login
+    
+    # Indexes
+    __table_args__ = (
+        # Covers the cache lookup in RealDataOrganizationAnalyticsService._get_cached_metrics
+        Index('idx_analytics_cache_lookup', 'organization_id', 'metric_type', 'time_range'),
+        # Expiry cleanup and the expired/with-hits cache statistics
+        Index('idx_analytics_cache_expires_at', 'expires_at'),
+        Index('idx_analytics_cache_with_hits', 'cache_hit_count',
+              postgresql_where=cache_hit_count > 0),
+    )
 
 
 class PlatformAnalyticsSummary(Base):
@@ -139,3 +149,11 @@ class AnalyticsJobLog(Base):
     
     # Relationships
     # organization = relationship("Organization", back_populates="analytics_jobs")  # Temporarily disabled to fix login
+    
+    # Indexes
+    __table_args__ = (
+        # Log retention cleanup and recent job statistics
+        Index('idx_analytics_job_log_created_at', 'created_at'),
+        Index('idx_analytics_job_log_failed', 'created_at',
+              postgresql_where=status == 'failed'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Float, String, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -12,6 +12,12 @@ class Invoice(Base):
     issue_date = Column(DateTime, nullable=False)
     status = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Partial index: monthly revenue sums paid invoices by issue date
+        Index('idx_invoices_paid_issue_date', 'issue_date', 'amount',
+              postgresql_where=status == 'paid'),
+    )
+
     # Temporarily commented out relationships to avoid circular import issues
     # user = relationship("User", back_populates="invoices")
     # subscription = relationship("Subscription", back_populates="invoices")
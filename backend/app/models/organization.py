@@ -2,7 +2,7 @@
 Organization model for B2B2C architecture
 Each organization represents a business customer of Sonicus
 """
-from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, Boolean, DateTime, JSON, ForeignKey, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -80,6 +80,11 @@ class Organization(Base):
     database_created = Column(Boolean, default=False)  # Track if org's database was created
     database_created_at = Column(DateTime, nullable=True)  # When database was created
     
+    __table_args__ = (
+        # New organization count in the admin dashboard snapshot
+        Index('idx_organizations_created_at', 'created_at'),
+    )
+    
     # Relationships
     # Temporarily commented out to avoid circular import issues
     # users = relationship("User", back_populates="organization")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Index
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 
@@ -12,6 +12,12 @@ class Subscription(Base):
     end_date = Column(DateTime, nullable=True)
     status = Column(String, nullable=False)
 
+    __table_args__ = (
+        # Partial index: active subscription count in the admin dashboard snapshot
+        Index('idx_subscriptions_active', 'status',
+              postgresql_where=status == 'active'),
+    )
+
     # Temporarily commented out relationships to avoid circular import issues
     # user = relationship("User", back_populates="subscriptions")
     # sound = relationship("TherapySound", back_populates="subscriptions")
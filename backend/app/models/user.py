@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timedelta
@@ -65,6 +65,12 @@ class User(Base):
     database_created = Column(Boolean, default=False)  # Track if user's database was created
     database_created_at = Column(DateTime, nullable=True)  # When database was created
     
+    __table_args__ = (
+        # Active and new user counts in the admin dashboard snapshot
+        Index('idx_users_last_login', 'last_login'),
+        Index('idx_users_created_at', 'created_at'),
+    )
+    
     # Add relationships - properly defined (ALL temporarily disabled to fix login)
     # organization = relationship("Organization", back_populates="users")
     # subscription = relationship("UserSubscription", back_populates="user", uselist=False)  # One-to-one relationship
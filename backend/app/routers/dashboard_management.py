@@ -10,11 +10,10 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
 
 from app.core.auth_dependencies import get_current_user_compatible
 from app.models.user import User, UserRole
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
 from app.services.dashboard_refresh import dashboard_refresh_service
 from app.routers.dashboard_websocket import dashboard_ws_manager, send_dashboard_alert
 from app.core.redis_caching import advanced_cache
@@ -47,8 +46,7 @@ async def require_super_admin(current_user: User = Depends(get_current_user_comp
 async def refresh_dashboard_data(
     background_tasks: BackgroundTasks,
     force: bool = False,
-    current_user: User = Depends(require_super_admin),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(require_super_admin)
 ):
     """
     Refresh all dashboard data manually.
@@ -57,7 +55,6 @@ async def refresh_dashboard_data(
         force: Force refresh even if one is in progress
         background_tasks: FastAPI background tasks
         current_user: Authenticated super admin user
-        db: Database session
     """
     try:
         if dashboard_refresh_service.refresh_in_progress and not force:
@@ -73,7 +70,6 @@ async def refresh_dashboard_data(
         # Start refresh in background
         background_tasks.add_task(
             _background_refresh_task,
-            db,
             getattr(current_user, 'id', 'unknown')
         )
         
@@ -97,10 +93,12 @@ async def refresh_dashboard_data(
         raise HTTPException(status_code=500, detail="Failed to initiate dashboard refresh")
 
 
-async def _background_refresh_task(db: Session, user_id: str):
+async def _background_refresh_task(user_id: str):
     """Background task for dashboard refresh."""
     try:
-        result = await dashboard_refresh_service.refresh_all_dashboard_data(db)
+        # The request's session is closed by the time background tasks run
+        async with AsyncSessionLocal() as db:
+            result = await dashboard_refresh_service.refresh_all_dashboard_data(db)
         
         # Send success notification
         await send_dashboard_alert({
@@ -126,6 +124,30 @@ async def _background_refresh_task(db: Session, user_id: str):
         })
 
 
+@router.get("/snapshot")
+async def get_dashboard_snapshot(
+    current_user: User = Depends(require_super_admin)
+):
+    """
+    Get the cached dashboard data immediately.
+    
+    Stale or missing sections trigger a background refresh; the response carries
+    the data's staleness and which sections are being refreshed.
+    """
+    try:
+        snapshot = await dashboard_refresh_service.get_dashboard_snapshot()
+        
+        return {
+            "success": True,
+            **snapshot,
+            "retrieved_at": datetime.now().isoformat()
+        }
+        
+    except Exception as e:
+        logger.error(f"Failed to get dashboard snapshot: {e}")
+        raise HTTPException(status_code=500, detail="Failed to retrieve dashboard snapshot")
+
+
 @router.get("/cache/status")
 async def get_cache_status(
     current_user: User = Depends(require_super_admin)
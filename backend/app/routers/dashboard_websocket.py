@@ -10,6 +10,7 @@ import json
 import logging
 from datetime import datetime
 from typing import Dict, Set, Optional, Any
+import orjson
 from fastapi import WebSocket, WebSocketDisconnect, Depends, HTTPException
 from fastapi.routing import APIRouter
 import jwt
@@ -42,10 +43,15 @@ class DashboardWebSocketManager:
         # Background update task
         self.update_task: Optional[asyncio.Task] = None
         self.update_interval = 30  # seconds
+        # Latest full dashboard refresh frame; admins get it as they connect, so
+        # the refresh deltas broadcast afterwards apply to the data they hold
+        self.latest_refresh_frame: Optional[bytes] = None
         
-    async def connect(self, websocket: WebSocket, user_id: str, user_role: str):
+    async def connect(self, websocket: WebSocket, user_id: str, user_role: UserRole):
         """Accept WebSocket connection and store it."""
         await websocket.accept()
+        if user_role == UserRole.SUPER_ADMIN:
+            await self._send_latest_refresh(websocket)
         self.active_connections[user_id] = websocket
         self.connection_metadata[user_id] = {
             "connected_at": datetime.now(),
@@ -59,6 +65,13 @@ class DashboardWebSocketManager:
         if len(self.active_connections) == 1 and self.update_task is None:
             self.update_task = asyncio.create_task(self._background_update_loop())
             
+    async def _send_latest_refresh(self, websocket: WebSocket):
+        """Send the latest full refresh frame, again if a newer one was published meanwhile."""
+        sent = None
+        while self.latest_refresh_frame is not sent:
+            sent = self.latest_refresh_frame
+            await websocket.send_text(sent.decode())
+            
     async def disconnect(self, user_id: str):
         """Remove WebSocket connection."""
         if user_id in self.active_connections:
@@ -86,6 +99,10 @@ class DashboardWebSocketManager:
                 
     async def broadcast_to_admins(self, message: dict):
         """Send message to all connected super admin users."""
+        await self.broadcast_raw(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS))
+        
+    async def broadcast_raw(self, frame: bytes):
+        """Send an already serialized JSON message to all connected super admin users."""
         admin_connections = {
             user_id: websocket for user_id, websocket in self.active_connections.items()
             if self.connection_metadata.get(user_id, {}).get("role") == UserRole.SUPER_ADMIN
@@ -93,15 +110,22 @@ class DashboardWebSocketManager:
         
         if not admin_connections:
             return
-            
+        
+        # Decoded once for every socket; dashboard clients JSON.parse text frames
+        text = frame.decode()
+        results = await asyncio.gather(
+            *(websocket.send_text(text) for websocket in admin_connections.values()),
+            return_exceptions=True
+        )
+        
+        now = datetime.now()
         disconnected_users = []
-        for user_id, websocket in admin_connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-                self.connection_metadata[user_id]["last_update"] = datetime.now()
-            except Exception as e:
-                logger.error(f"Failed to broadcast to user {user_id}: {e}")
+        for user_id, result in zip(admin_connections, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to broadcast to user {user_id}: {result}")
                 disconnected_users.append(user_id)
+            elif user_id in self.connection_metadata:
+                self.connection_metadata[user_id]["last_update"] = now
                 
         # Clean up disconnected users
         for user_id in disconnected_users:
@@ -232,7 +256,7 @@ async def dashboard_websocket_endpoint(
     
     try:
         # Accept connection
-        await dashboard_ws_manager.connect(websocket, user_id, str(getattr(user, 'role', 'unknown')))
+        await dashboard_ws_manager.connect(websocket, user_id, user.role)
         
         # Send initial dashboard data
         initial_message = {
@@ -48,7 +48,8 @@ from app.schemas.user_unified import (
     PasswordResetSchema,
     TrialStartResponseSchema,
     SuccessResponseSchema,
-    DailyAnalyticsSchema,
+    DAILY_ANALYTICS_ADAPTER,
+    USER_SOUND_PACKAGE_ADAPTER,
     create_user_response
 )
 
@@ -994,13 +995,13 @@ async def get_user_analytics(
             if stress_before and stress_after:
                 mood_improvement = stress_before - stress_after
             
-            daily_analytics.append(DailyAnalyticsSchema(
-                date=getattr(a, 'date').isoformat(),
-                sessions_count=getattr(a, 'sessions_count', 0),
-                listening_time_minutes=getattr(a, 'total_listening_time_minutes', 0),
-                completion_rate=getattr(a, 'completion_rate', 0.0),
-                mood_improvement=mood_improvement
-            ))
+            daily_analytics.append({
+                "date": getattr(a, 'date').isoformat(),
+                "sessions_count": getattr(a, 'sessions_count', 0),
+                "listening_time_minutes": getattr(a, 'total_listening_time_minutes', 0),
+                "completion_rate": getattr(a, 'completion_rate', 0.0),
+                "mood_improvement": mood_improvement
+            })
         
         return UserAnalyticsSchema(
             period_days=days,
@@ -1010,7 +1011,7 @@ async def get_user_analytics(
             completion_rate=avg_completion_rate,
             wellness_streak_days=wellness_streak,
             average_wellness_improvement=avg_wellness_improvement,
-            daily_analytics=daily_analytics
+            daily_analytics=DAILY_ANALYTICS_ADAPTER.validate_python(daily_analytics)
         )
         
     except Exception as e:
@@ -1043,19 +1044,19 @@ async def get_user_sound_packages(
         
         packages = []
         for assignment, package in assignments:
-            packages.append(UserSoundPackageSchema(
-                id=getattr(assignment, 'id'),
-                sound_package_id=getattr(assignment, 'sound_package_id'),
-                package_name=getattr(package, 'name', 'Unknown Package'),
-                description=getattr(package, 'description'),
-                access_granted_at=getattr(assignment, 'access_granted_at'),
-                access_expires_at=getattr(assignment, 'access_expires_at'),
-                usage_count=getattr(assignment, 'usage_count', 0),
-                last_used_at=getattr(assignment, 'last_used_at'),
-                is_active=getattr(assignment, 'is_active', True)
-            ))
-        
-        return packages
+            packages.append({
+                "id": getattr(assignment, 'id'),
+                "sound_package_id": getattr(assignment, 'sound_package_id'),
+                "package_name": getattr(package, 'name', 'Unknown Package'),
+                "description": getattr(package, 'description'),
+                "access_granted_at": getattr(assignment, 'access_granted_at'),
+                "access_expires_at": getattr(assignment, 'access_expires_at'),
+                "usage_count": getattr(assignment, 'usage_count', 0),
+                "last_used_at": getattr(assignment, 'last_used_at'),
+                "is_active": getattr(assignment, 'is_active', True)
+            })
+        
+        return USER_SOUND_PACKAGE_ADAPTER.validate_python(packages)
         
     except Exception as e:
         logger.error(f"Error getting sound packages for user {user_id}: {e}")
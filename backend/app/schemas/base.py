@@ -0,0 +1,10 @@
+"""
+Shared base classes for Pydantic schemas.
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ORMBaseSchema(BaseModel):
+    """Base for response schemas that are populated from SQLAlchemy models."""
+    model_config = ConfigDict(from_attributes=True)
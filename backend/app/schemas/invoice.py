@@ -1,11 +1,8 @@
-from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.base import ORMBaseSchema
 
-class InvoiceReadSchema(BaseModel):
+class InvoiceReadSchema(ORMBaseSchema):
     id: int
     amount: float
     issue_date: datetime
     status: str
-
-    class Config:
-        from_attributes = True  # Updated from orm_mode to from_attributes
@@ -5,12 +5,19 @@ Pydantic schemas for Organization model and related data structures.
 import uuid
 from datetime import datetime
 from typing import Optional, Dict, Any, List
-from pydantic import BaseModel, Field, validator, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, validator, EmailStr
 from enum import Enum
 
 from app.models.organization import OrganizationStatus, SubscriptionTier
 
 
+# Shared JSON encoders, defined once and referenced by each schema config.
+_JSON_ENCODERS = {
+    datetime: lambda v: v.isoformat() if v else None,
+    uuid.UUID: lambda v: str(v)
+}
+
+
 class OrganizationBase(BaseModel):
     """Base organization schema with common fields."""
     name: str = Field(..., min_length=1, max_length=255, description="Organization name")
@@ -152,13 +159,7 @@ class OrganizationResponse(BaseModel):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        """Pydantic configuration."""
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None,
-            uuid.UUID: lambda v: str(v)
-        }
+    model_config = ConfigDict(from_attributes=True, json_encoders=_JSON_ENCODERS)
 
 
 class OrganizationList(BaseModel):
@@ -204,12 +205,7 @@ class OrganizationAnalytics(BaseModel):
     trial_end_date: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None,
-            uuid.UUID: lambda v: str(v)
-        }
+    model_config = ConfigDict(json_encoders=_JSON_ENCODERS)
 
 
 class OrganizationSummary(BaseModel):
@@ -224,13 +220,7 @@ class OrganizationSummary(BaseModel):
     max_users: int
     created_at: datetime
 
-    class Config:
-        """Pydantic configuration."""
-        from_attributes = True
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None,
-            uuid.UUID: lambda v: str(v)
-        }
+    model_config = ConfigDict(from_attributes=True, json_encoders=_JSON_ENCODERS)
 
 
 class OrganizationHealthCheck(BaseModel):
@@ -244,12 +234,7 @@ class OrganizationHealthCheck(BaseModel):
     issues: List[str] = Field(default_factory=list)
     checked_at: datetime
 
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None,
-            uuid.UUID: lambda v: str(v)
-        }
+    model_config = ConfigDict(json_encoders=_JSON_ENCODERS)
 
 
 # ==================== ONBOARDING SCHEMAS ====================
@@ -8,11 +8,13 @@ Created: July 26, 2025
 Author: Sonicus Platform Team
 """
 
-from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from pydantic import BaseModel, ConfigDict, Field, validator
+from typing import List, Literal, Optional, Dict, Any, Tuple
+from datetime import date, datetime, time
 from enum import Enum
 
+from app.schemas.base import ORMBaseSchema
+
 # =================== ENUMS ===================
 
 class SoundPackageType(str, Enum):
@@ -41,6 +43,8 @@ class PackageAssignmentStatus(str, Enum):
 
 class SoundInfo(BaseModel):
     """Schema for sound information within packages"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     id: int
     title: str
     description: Optional[str] = None
@@ -54,7 +58,7 @@ class PackageDeliverySchedule(BaseModel):
     """Schema for package delivery scheduling"""
     delivery_type: str = Field(..., description="daily, weekly, custom")
     frequency: int = Field(1, ge=1, description="Frequency of delivery")
-    time_of_day: Optional[str] = Field(None, description="Preferred delivery time (HH:MM)")
+    time_of_day: Optional[time] = Field(None, description="Preferred delivery time (HH:MM)")
     days_of_week: Optional[List[int]] = Field(None, description="Days for weekly delivery (0-6)")
     custom_schedule: Optional[Dict[str, Any]] = None
 
@@ -66,18 +70,12 @@ class PackageCreateRequest(BaseModel):
     description: Optional[str] = Field(None, max_length=1000)
     category: Optional[str] = Field(None, max_length=100)
     package_type: SoundPackageType = SoundPackageType.CUSTOM
-    sound_ids: List[int]
+    sound_ids: Tuple[int, ...] = Field(..., min_length=1, description="At least one sound ID is required")
     auto_assign_new_users: bool = False
     delivery_schedule: Optional[PackageDeliverySchedule] = None
     assign_to_employees: List[int] = Field(default_factory=list)
     assignment_notes: Optional[str] = Field(None, max_length=500)
     
-    @validator('sound_ids')
-    def validate_sound_ids(cls, v):
-        if not v or len(v) == 0:
-            raise ValueError('At least one sound ID is required')
-        return v
-    
     @validator('name')
     def validate_name(cls, v):
         if not v or not v.strip():
@@ -89,30 +87,18 @@ class PackageUpdateRequest(BaseModel):
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = Field(None, max_length=1000)
     category: Optional[str] = Field(None, max_length=100)
-    sound_ids: Optional[List[int]] = None
+    sound_ids: Optional[Tuple[int, ...]] = Field(None, min_length=1, description="If provided, must contain at least one ID")
     status: Optional[SoundPackageStatus] = None
     auto_assign_new_users: Optional[bool] = None
     delivery_schedule: Optional[PackageDeliverySchedule] = None
-    
-    @validator('sound_ids')
-    def validate_sound_ids(cls, v):
-        if v is not None and len(v) == 0:
-            raise ValueError('If provided, sound_ids must contain at least one ID')
-        return v
 
 class PackageAssignmentRequest(BaseModel):
     """Schema for assigning packages to employees"""
-    employee_ids: List[int]
+    employee_ids: Tuple[int, ...] = Field(..., min_length=1, description="At least one employee ID is required")
     assignment_notes: Optional[str] = Field(None, max_length=500)
     send_notification: bool = True
     auto_start: bool = True
     custom_deadline: Optional[datetime] = None
-    
-    @validator('employee_ids')
-    def validate_employee_ids(cls, v):
-        if not v or len(v) == 0:
-            raise ValueError('At least one employee ID is required')
-        return v
 
 # =================== RESPONSE SCHEMAS ===================
 
@@ -128,7 +114,7 @@ class PackageBasicInfo(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-class PackageResponse(BaseModel):
+class PackageResponse(ORMBaseSchema):
     """Comprehensive package information response"""
     id: str
     name: str
@@ -149,9 +135,6 @@ class PackageResponse(BaseModel):
     updated_at: datetime
     sounds: List[SoundInfo]
     delivery_schedule: Optional[PackageDeliverySchedule] = None
-    
-    class Config:
-        from_attributes = True
 
 class PackageListResponse(BaseModel):
     """Schema for paginated package list response"""
@@ -164,6 +147,8 @@ class PackageListResponse(BaseModel):
 
 class EmployeeAssignmentInfo(BaseModel):
     """Schema for employee package assignment information"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     employee_id: int
     employee_email: str
     employee_name: Optional[str]
@@ -189,6 +174,8 @@ class PackageAssignmentResponse(BaseModel):
 
 class SoundPopularityInfo(BaseModel):
     """Schema for sound popularity within packages"""
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
     sound_id: int
     title: str
     play_count: int
@@ -198,7 +185,9 @@ class SoundPopularityInfo(BaseModel):
 
 class DailyUsageMetrics(BaseModel):
     """Schema for daily usage metrics"""
-    date: str
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    date: date
     total_plays: int
     unique_users: int
     total_duration_minutes: float
@@ -249,15 +238,9 @@ class PackageUsageAnalytics(BaseModel):
 class BulkPackageOperation(BaseModel):
     """Schema for bulk package operations"""
     operation: str = Field(..., description="activate, deactivate, delete, assign")
-    package_ids: List[str]
+    package_ids: Tuple[str, ...] = Field(..., min_length=1, description="At least one package ID is required")
     target_employee_ids: Optional[List[int]] = None
     operation_notes: Optional[str] = None
-    
-    @validator('package_ids')
-    def validate_package_ids(cls, v):
-        if not v or len(v) == 0:
-            raise ValueError('At least one package ID is required')
-        return v
 
 class BulkOperationResponse(BaseModel):
     """Schema for bulk operation response"""
@@ -290,11 +273,5 @@ class PackageSearchFilters(BaseModel):
 class PackageSortOptions(BaseModel):
     """Schema for package sorting options"""
     sort_by: str = Field("created_at", description="Field to sort by")
-    sort_order: str = Field("desc", description="Sort order: asc or desc")
+    sort_order: Literal["asc", "desc"] = Field("desc", description="Sort order: asc or desc")
     secondary_sort: Optional[str] = None
-    
-    @validator('sort_order')
-    def validate_sort_order(cls, v):
-        if v not in ['asc', 'desc']:
-            raise ValueError('Sort order must be either "asc" or "desc"')
-        return v
@@ -1,14 +1,12 @@
 from pydantic import BaseModel
 from datetime import datetime
+from app.schemas.base import ORMBaseSchema
 
 class SubscriptionCreateSchema(BaseModel):
     sound_id: int
 
-class SubscriptionReadSchema(BaseModel):
+class SubscriptionReadSchema(ORMBaseSchema):
     id: int
     start_date: datetime
     end_date: datetime
     status: str
-
-    class Config:
-        from_attributes = True  # Updated from orm_mode to from_attributes
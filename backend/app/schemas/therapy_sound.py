@@ -1,18 +1,16 @@
 from pydantic import BaseModel
 from typing import Optional
+from app.schemas.base import ORMBaseSchema
 
-class SoundReadSchema(BaseModel):
+class SoundReadSchema(ORMBaseSchema):
     id: int
     title: str
     description: str
     category: str
     duration: float
 
-    class Config:
-        from_attributes = True  # Updated from orm_mode to from_attributes
-
 # New schemas for admin functionality
-class TherapySoundResponse(BaseModel):
+class TherapySoundResponse(ORMBaseSchema):
     id: int
     title: str
     description: str
@@ -22,9 +20,6 @@ class TherapySoundResponse(BaseModel):
     thumbnail_url: Optional[str] = None
     is_premium: Optional[bool] = False
 
-    class Config:
-        from_attributes = True
-
 class TherapySoundCreate(BaseModel):
     title: str
     description: str
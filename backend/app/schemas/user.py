@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import datetime
 from app.models.user import SubscriptionStatus, PaymentMethod, UserRole
+from app.schemas.base import ORMBaseSchema
 
 class UserCreateSchema(BaseModel):
     email: EmailStr
@@ -17,20 +18,18 @@ class UserLoginSchema(BaseModel):
     email: EmailStr
     password: str
 
-class UserReadSchema(BaseModel):
+class UserBaseSchema(ORMBaseSchema):
+    """Fields shared by every user response schema."""
     id: int
-    email: EmailStr
+    email: str  # Already validated on write; no EmailStr re-check on reads
+
+class UserReadSchema(UserBaseSchema):
     is_active: bool
     role: UserRole  # Include role for dashboard routing
     organization_id: Optional[str] = None  # Include organization_id for business admin access
 
-    class Config:
-        from_attributes = True  # Updated from orm_mode to from_attributes
-
 # New schemas for admin functionality
-class UserResponse(BaseModel):
-    id: int
-    email: EmailStr
+class UserResponse(UserBaseSchema):
     is_active: bool
     is_superuser: bool
     created_at: datetime
@@ -41,9 +40,6 @@ class UserResponse(BaseModel):
     telephone: Optional[str] = None
     preferred_payment_method: Optional[PaymentMethod] = None
 
-    class Config:
-        from_attributes = True
-
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     is_active: Optional[bool] = None
@@ -4,16 +4,16 @@ B2C User Schemas
 Pydantic schemas for B2C user management endpoints.
 """
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime, date
 from uuid import UUID
 
+from app.schemas.user import UserBaseSchema
 
-class UserProfileResponse(BaseModel):
+
+class UserProfileResponse(UserBaseSchema):
     """User profile response for B2C."""
-    id: int
-    email: str
     first_name: Optional[str] = None
     last_name: Optional[str] = None
     subscription_tier: Optional[str] = None
@@ -68,10 +68,10 @@ class UserPreferencesResponse(BaseModel):
     id: UUID
     preferred_session_length: int = 20
     preferred_time_of_day: Optional[str] = None
-    notification_preferences: Dict[str, Any] = {}
-    theme_preferences: Dict[str, Any] = {}
-    audio_preferences: Dict[str, Any] = {}
-    privacy_settings: Dict[str, Any] = {}
+    notification_preferences: Dict[str, Any] = Field(default_factory=dict)
+    theme_preferences: Dict[str, Any] = Field(default_factory=dict)
+    audio_preferences: Dict[str, Any] = Field(default_factory=dict)
+    privacy_settings: Dict[str, Any] = Field(default_factory=dict)
     created_at: datetime
     updated_at: datetime
 
@@ -91,7 +91,9 @@ class UserSoundPackageResponse(BaseModel):
 
 class DailyAnalytics(BaseModel):
     """Daily analytics data."""
-    date: str  # ISO date string
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    date: date
     sessions_count: int
     listening_time_minutes: int
     completion_rate: float
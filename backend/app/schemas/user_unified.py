@@ -5,9 +5,9 @@ Combines features from user.py, user_b2c.py, and users_simple.py
 Supports both B2B2C (organization-based) and B2C (direct customer) modes
 """
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 from typing import Optional, List, Dict, Any, Union
-from datetime import datetime
+from datetime import datetime, timezone
 from uuid import UUID
 from app.models.user import UserRole, PaymentMethod, SubscriptionStatus
 
@@ -15,7 +15,7 @@ from app.models.user import UserRole, PaymentMethod, SubscriptionStatus
 
 class UserBaseSchema(BaseModel):
     """Base schema with common user fields."""
-    email: EmailStr
+    email: str  # Response-only; emails are validated by the request schemas
     is_active: bool = True
 
 class UserIdentitySchema(UserBaseSchema):
@@ -24,13 +24,15 @@ class UserIdentitySchema(UserBaseSchema):
     role: UserRole
     organization_id: Optional[UUID] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 # === Profile Update Schemas ===
 
 class UserProfileUpdateSchema(BaseModel):
-    """Schema for updating user profile information."""
+    """Schema for updating user profile information.
+
+    Unknown fields are ignored (pydantic's default) for future extensibility.
+    """
     email: Optional[EmailStr] = None
     telephone: Optional[str] = None
     company_name: Optional[str] = None
@@ -39,40 +41,24 @@ class UserProfileUpdateSchema(BaseModel):
     preferred_payment_method: Optional[PaymentMethod] = None
     language: Optional[str] = None  # For internationalization
     notifications_enabled: Optional[bool] = None
-    
-    class Config:
-        # Allow extra fields for future extensibility
-        extra = "ignore"
 
 # === Registration Schemas ===
 
 class CustomerRegistrationSchema(BaseModel):
     """Schema for B2C customer registration."""
     email: EmailStr
-    password: str
+    password: str = Field(..., min_length=8, description="Must be at least 8 characters long")
     name: str  # Full name for B2C customers
-    
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
 
 class OrganizationRegistrationSchema(BaseModel):
     """Schema for B2B2C organization registration."""
     email: EmailStr
-    password: str
+    password: str = Field(..., min_length=8, description="Must be at least 8 characters long")
     company_name: str
     business_type: Optional[str] = None
     country: Optional[str] = None
     telephone: Optional[str] = None
     preferred_payment_method: Optional[PaymentMethod] = None
-    
-    @validator('password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
 
 class UserRegistrationCompletionSchema(BaseModel):
     """Schema for completing user registration with additional details."""
@@ -101,7 +87,7 @@ class UserProfileSchema(UserIdentitySchema):
 class UserB2CProfileSchema(BaseModel):
     """B2C-specific user profile with enhanced features."""
     id: int
-    email: EmailStr
+    email: str
     name: Optional[str] = None
     subscription_tier: Optional[str] = None
     subscription_status: Optional[str] = None
@@ -114,8 +100,7 @@ class UserB2CProfileSchema(BaseModel):
     has_subscription_details: bool = False
     has_preferences: bool = False
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # === Subscription Schemas ===
 
@@ -142,8 +127,7 @@ class SubscriptionResponseSchema(BaseModel):
     next_payment_date: Optional[datetime] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # === Preferences Schemas ===
 
@@ -151,10 +135,12 @@ class UserPreferencesSchema(BaseModel):
     """User preferences and settings."""
     preferred_session_length: Optional[int] = 20
     preferred_time_of_day: Optional[str] = None
-    notification_preferences: Optional[Dict[str, Any]] = {}
-    theme_preferences: Optional[Dict[str, Any]] = {}
-    audio_preferences: Optional[Dict[str, Any]] = {}
-    privacy_settings: Optional[Dict[str, Any]] = {}
+    # Open-ended JSONB maps: clients may store keys and value types beyond the
+    # documented ones, and every stored key must survive a read and write
+    notification_preferences: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    theme_preferences: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    audio_preferences: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    privacy_settings: Optional[Dict[str, Any]] = Field(default_factory=dict)
 
 class UserPreferencesResponseSchema(UserPreferencesSchema):
     """User preferences response with metadata."""
@@ -163,8 +149,7 @@ class UserPreferencesResponseSchema(UserPreferencesSchema):
     created_at: datetime
     updated_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # === Analytics Schemas ===
 
@@ -192,7 +177,9 @@ class UserAnalyticsSchema(BaseModel):
 class UserSoundPackageSchema(BaseModel):
     """User sound package assignment."""
     id: UUID
-    sound_package_id: Union[UUID, int]  # Support both UUID and int package IDs
+    # UserSoundPackage.sound_package_id is an Integer column, but keep UUID for
+    # SoundPackage.id. Try int first instead of smart-mode probing every branch.
+    sound_package_id: Union[int, UUID] = Field(..., union_mode="left_to_right")
     package_name: str
     description: Optional[str] = None
     access_granted_at: datetime
@@ -201,8 +188,12 @@ class UserSoundPackageSchema(BaseModel):
     last_used_at: Optional[datetime] = None
     is_active: bool = True
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+# Module-level adapters so list responses are validated in a single call
+# instead of instantiating each item schema in a Python loop.
+DAILY_ANALYTICS_ADAPTER = TypeAdapter(List[DailyAnalyticsSchema])
+USER_SOUND_PACKAGE_ADAPTER = TypeAdapter(List[UserSoundPackageSchema])
 
 # === Authentication Schemas ===
 
@@ -213,6 +204,8 @@ class UserLoginSchema(BaseModel):
 
 class TokenSchema(BaseModel):
     """JWT token response."""
+    model_config = ConfigDict(frozen=True)
+
     access_token: str
     token_type: str = "bearer"
     expires_in: Optional[int] = None
@@ -225,13 +218,7 @@ class PasswordResetRequestSchema(BaseModel):
 class PasswordResetSchema(BaseModel):
     """Password reset with token."""
     token: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
+    new_password: str = Field(..., min_length=8, description="Must be at least 8 characters long")
 
 # === Platform Detection Schemas ===
 
@@ -245,17 +232,22 @@ class PlatformModeSchema(BaseModel):
 
 # === Error Response Schemas ===
 
+def _utc_now() -> datetime:
+    """Timestamp factory so each response gets its own creation time."""
+    return datetime.now(timezone.utc)
+
+
 class ErrorResponseSchema(BaseModel):
     """Standard error response."""
     detail: str
     error_code: Optional[str] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 class ValidationErrorSchema(BaseModel):
     """Validation error response."""
     detail: str
     field_errors: Optional[Dict[str, List[str]]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 # === Success Response Schemas ===
 
@@ -263,10 +255,12 @@ class SuccessResponseSchema(BaseModel):
     """Standard success response."""
     message: str
     data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=_utc_now)
 
 class TrialStartResponseSchema(BaseModel):
     """Trial start response."""
+    model_config = ConfigDict(frozen=True)
+
     message: str
     trial_end_date: datetime
     days_remaining: int
@@ -296,25 +290,28 @@ class UserUpdateAdminSchema(BaseModel):
 
 def create_user_response(user, include_sensitive: bool = False) -> Dict[str, Any]:
     """Create a safe user response dictionary from SQLAlchemy model."""
+    # All of these are mapped columns on User, so read them directly rather
+    # than through getattr() with fallbacks. The result stays a plain dict
+    # because callers cache it as JSON before building the response schema.
     response = {
-        "id": getattr(user, 'id'),
-        "email": getattr(user, 'email'),
-        "role": getattr(user, 'role'),
-        "is_active": getattr(user, 'is_active', True),
-        "organization_id": getattr(user, 'organization_id', None),
-        "created_at": getattr(user, 'created_at')
+        "id": user.id,
+        "email": user.email,
+        "role": user.role,
+        "is_active": user.is_active,
+        "organization_id": user.organization_id,
+        "created_at": user.created_at
     }
     
     if include_sensitive:
         response.update({
-            "telephone": getattr(user, 'telephone', None),
-            "preferred_payment_method": getattr(user, 'preferred_payment_method', None),
-            "company_name": getattr(user, 'company_name', None),
-            "business_type": getattr(user, 'business_type', None),
-            "country": getattr(user, 'country', None),
-            "trial_start_date": getattr(user, 'trial_start_date', None),
-            "trial_end_date": getattr(user, 'trial_end_date', None),
-            "subscription_status": getattr(user, 'subscription_status', SubscriptionStatus.TRIAL)
+            "telephone": user.telephone,
+            "preferred_payment_method": user.preferred_payment_method,
+            "company_name": user.company_name,
+            "business_type": user.business_type,
+            "country": user.country,
+            "trial_start_date": user.trial_start_date,
+            "trial_end_date": user.trial_end_date,
+            "subscription_status": user.subscription_status
         })
     
     return response
@@ -0,0 +1,155 @@
+"""
+Analytics Job Log
+
+Buffered AnalyticsJobLog writes shared by the Celery analytics jobs and the
+in-process analytics refresh service:
+- Entries are collected in a list while a job runs and flushed once at the end
+- Inside the API process a background writer batches flushed entries into
+  a few inserts; everywhere else they are inserted directly
+"""
+
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+import logging
+import asyncio
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.analytics_cache import AnalyticsJobLog
+
+logger = logging.getLogger(__name__)
+
+# Background log writer: queue bound, entries per insert and max wait before a flush
+LOG_QUEUE_MAXSIZE = 10000
+LOG_BATCH_SIZE = 50
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+
+
+def log_job_execution(
+    job_logs: List[Dict[str, Any]],
+    job_name: str,
+    organization_id: Optional[str] = None,
+    status: str = "started",
+    details: Optional[Dict[str, Any]] = None,
+    execution_time_ms: Optional[int] = None
+):
+    """Buffer an analytics job log entry; written by flush_job_logs."""
+    # Stamp the entry now rather than when the buffer is flushed
+    logged_at = datetime.utcnow()
+    job_logs.append({
+        "job_type": job_name,
+        "organization_id": organization_id,
+        "status": status,
+        "result_summary": details or {},
+        "duration_seconds": execution_time_ms / 1000 if execution_time_ms is not None else None,
+        "error_message": (details or {}).get("error") if status == "failed" else None,
+        "started_at": logged_at,
+        "created_at": logged_at
+    })
+
+
+class JobLogWriter:
+    """Writes buffered job log entries, batching them in the background when running."""
+
+    def __init__(self):
+        self.db_session = SessionLocal
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_count = 0
+
+    def flush(self, db: Session, job_logs: List[Dict[str, Any]]):
+        """
+        Write buffered job log entries and clear the buffer.
+
+        Entries are handed to the background writer when it runs on the current
+        event loop; otherwise they are written in a single insert and commit.
+        """
+        if not job_logs:
+            return
+
+        if self._running():
+            for entry in job_logs:
+                try:
+                    self._queue.put_nowait(entry)
+                except asyncio.QueueFull:
+                    self.dropped_count += 1
+                    logger.warning("Analytics job log queue full, dropped %s entries so far", self.dropped_count)
+            job_logs.clear()
+            return
+
+        try:
+            db.execute(insert(AnalyticsJobLog), job_logs)
+            db.commit()
+            job_logs.clear()
+
+        except Exception as e:
+            logger.error("Failed to log job execution: %s", e)
+            db.rollback()
+
+    def _running(self) -> bool:
+        """Whether the background writer is running on the current event loop."""
+        if self._task is None or self._task.done():
+            return False
+        try:
+            return asyncio.get_running_loop() is self._task.get_loop()
+        except RuntimeError:
+            return False
+
+    def _write(self, entries: List[Dict[str, Any]]):
+        """Insert a batch of log entries in a session of its own."""
+        db = self.db_session()
+        try:
+            self.flush(db, entries)
+        finally:
+            db.close()
+
+    async def _run(self):
+        """Batch queued log entries into inserts of up to LOG_BATCH_SIZE rows."""
+        loop = asyncio.get_running_loop()
+        while True:
+            entry = await self._queue.get()
+            stopping = entry is None
+            batch = [] if stopping else [entry]
+            deadline = loop.time() + LOG_FLUSH_INTERVAL
+
+            while not stopping and len(batch) < LOG_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if entry is None:
+                    stopping = True
+                else:
+                    batch.append(entry)
+
+            if batch:
+                await asyncio.to_thread(self._write, batch)
+            if stopping:
+                return
+
+    def start(self):
+        """Start the background writer on the running event loop (application startup)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush queued entries and stop the background writer (application shutdown)."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(None)
+            await self._task
+        self._task = None
+
+
+# Global writer instance
+job_log_writer = JobLogWriter()
+
+
+def flush_job_logs(db: Session, job_logs: List[Dict[str, Any]]):
+    """Write buffered job log entries through the shared writer."""
+    job_log_writer.flush(db, job_logs)
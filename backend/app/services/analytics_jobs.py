@@ -6,25 +6,63 @@ Celery-based background job system for analytics:
 - Data refresh and synchronization
 - Health monitoring and alerts
 - Performance optimization tasks
+
+Tasks are routed to the "analytics" queue, except the health check, cache
+cleanup and dashboard snapshot refresh, which go to "ops_high" so a refresh backlog cannot delay them, and the
+per-organization refreshes, which go to "refresh_bulk". Run one worker per queue:
+    celery -A app.services.analytics_jobs worker -Q ops_high
+    celery -A app.services.analytics_jobs worker -Q analytics,refresh_bulk
 """
 
-from celery import Celery
+from celery import Celery, group
 from celery.schedules import crontab
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta, date
 import logging
 import asyncio
+import os
+import threading
+import time
+from itertools import chain
+from sqlalchemy import func, lambda_stmt, select
 from sqlalchemy.orm import Session
 
 from app.db.session import SessionLocal
-from app.models.organization import Organization
+from app.db.utils import DASHBOARD_SNAPSHOT_VIEW, delete_in_batches, refresh_materialized_view
+from app.models.organization import Organization, OrganizationStatus
 from app.models.analytics_cache import AnalyticsJobLog, OrganizationAnalyticsCache
-from app.services.real_data_analytics import RealDataOrganizationAnalyticsService
+from app.core.cache import redis_client
+from app.services.analytics_job_log import log_job_execution, flush_job_logs
+from app.services.analytics_refresh import CACHE_STATISTICS_KEY
+from app.services.real_data_analytics import RealDataOrganizationAnalyticsService, CACHE_STATS_KEY
 from app.services.websocket_analytics import RealTimeAnalyticsBroadcaster
 from app.schemas.organization_analytics import MetricTimeRange
 
 logger = logging.getLogger(__name__)
 
+# Organization ids fetched (and refreshes queued) per batch by the refresh_all jobs
+ORGANIZATION_BATCH_SIZE = 500
+
+# Repeat manual full refreshes are ignored for this long after one starts
+FULL_REFRESH_LOCK_KEY = "lock:analytics:full_refresh"
+FULL_REFRESH_LOCK_TTL = 600  # seconds
+
+# Usage metrics cached more recently than this are not recomputed by the refresh job
+USAGE_CACHE_FRESHNESS = timedelta(minutes=15)
+
+# Active organization ids are shared between refresh_all jobs for a few minutes
+ACTIVE_ORG_IDS_CACHE_KEY = "analytics:active_org_ids"
+ACTIVE_ORG_IDS_CACHE_TTL = 300  # seconds
+
+# Use libuv's event loop for the run_async() loop in these jobs when
+# available (uvloop ships with uvicorn[standard]; not on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Initialize Celery app
 celery_app = Celery(
     'analytics_jobs',
@@ -39,6 +77,15 @@ celery_app.conf.update(
     result_serializer='json',
     timezone='UTC',
     enable_utc=True,
+    task_routes={
+        'app.services.analytics_jobs.analytics_system_health_check': {'queue': 'ops_high'},
+        'app.services.analytics_jobs.cleanup_expired_cache': {'queue': 'ops_high'},
+        'app.services.analytics_jobs.refresh_dashboard_snapshot_view': {'queue': 'ops_high'},
+        'app.services.analytics_jobs.refresh_organization_usage_metrics': {'queue': 'refresh_bulk'},
+        'app.services.analytics_jobs.*': {'queue': 'analytics'},
+    },
+    # Reserve one task at a time so queued refreshes are not hoarded by a worker
+    worker_prefetch_multiplier=1,
     beat_schedule={
         # Analytics refresh schedules
         'refresh-usage-metrics': {
@@ -57,6 +104,10 @@ celery_app.conf.update(
             'task': 'app.services.analytics_jobs.cleanup_expired_cache',
             'schedule': crontab(minute=0, hour=2),  # Daily at 2 AM
         },
+        'refresh-dashboard-snapshot': {
+            'task': 'app.services.analytics_jobs.refresh_dashboard_snapshot_view',
+            'schedule': crontab(minute='*/5'),  # Every 5 minutes, as the dashboard cache
+        },
         'analytics-health-check': {
             'task': 'app.services.analytics_jobs.analytics_system_health_check',
             'schedule': crontab(minute='*/15'),  # Every 15 minutes
@@ -65,50 +116,104 @@ celery_app.conf.update(
 )
 
 
+# Event loop shared by every task in this worker process, run on a daemon thread
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_pid: Optional[int] = None
+_loop_lock = threading.Lock()
+
+
+def run_async(coro):
+    """Run a coroutine on the process's background event loop and wait for its result."""
+    global _loop, _loop_pid
+    with _loop_lock:
+        # Prefork workers must not reuse a loop whose thread lived in the parent
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(
+                target=_loop.run_forever, name="analytics-jobs-loop", daemon=True
+            ).start()
+        loop = _loop
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
 def get_db_session():
     """Get database session for background tasks."""
     db = SessionLocal()
     try:
         return db
     except Exception as e:
-        logger.error(f"Failed to create database session: {e}")
+        logger.error("Failed to create database session: %s", e)
         db.close()
         raise
 
 
-def log_job_execution(
+def iter_active_organization_ids(db: Session, batch_size: int = ORGANIZATION_BATCH_SIZE):
+    """Yield active organization ids in batches, from Redis or a server-side cursor."""
+    cached_ids = redis_client.get_json(ACTIVE_ORG_IDS_CACHE_KEY)
+    if isinstance(cached_ids, list):
+        for i in range(0, len(cached_ids), batch_size):
+            yield cached_ids[i:i + batch_size]
+        return
+    
+    # Organizations have no is_active flag; trial and active subscriptions count
+    result = db.execute(
+        select(Organization.id)
+        .where(Organization.subscription_status.in_([
+            OrganizationStatus.TRIAL.value,
+            OrganizationStatus.ACTIVE.value
+        ]))
+        .execution_options(yield_per=batch_size)
+    )
+    org_ids: List[str] = []
+    for batch in result.scalars().partitions():
+        batch_ids = [str(org_id) for org_id in batch]
+        org_ids.extend(batch_ids)
+        yield batch_ids
+    
+    # Only cache the list once it has been read in full
+    redis_client.set_json(ACTIVE_ORG_IDS_CACHE_KEY, org_ids, expire=ACTIVE_ORG_IDS_CACHE_TTL)
+
+
+async def _refresh_usage_metrics(
     db: Session,
-    job_name: str,
-    organization_id: Optional[str] = None,
-    status: str = "started",
-    details: Optional[Dict[str, Any]] = None,
-    execution_time_ms: Optional[int] = None
-):
-    """Log analytics job execution for monitoring."""
+    analytics_service: RealDataOrganizationAnalyticsService,
+    organization_id: str,
+    time_ranges: List[MetricTimeRange]
+) -> Dict[str, str]:
+    """Refresh each time range, then broadcast the update."""
+    # The metrics queries block and never await, so the ranges run in a plain loop
+    results = {}
+    for time_range in time_ranges:
+        try:
+            analytics_service.compute_real_time_usage_metrics(
+                organization_id=organization_id,
+                time_range=time_range
+            )
+            results[time_range.value] = "success"
+        except Exception as e:
+            logger.error("Failed to refresh %s metrics for org %s: %s", time_range.value, organization_id, e)
+            results[time_range.value] = f"error: {str(e)}"
+    
+    # Broadcast update to connected clients
     try:
-        job_log = AnalyticsJobLog(
-            job_name=job_name,
-            organization_id=organization_id,
-            status=status,
-            execution_details=details or {},
-            execution_time_ms=execution_time_ms
-        )
-        db.add(job_log)
-        db.commit()
-        
+        broadcaster = RealTimeAnalyticsBroadcaster(db)
+        await broadcaster.broadcast_usage_update(organization_id)
     except Exception as e:
-        logger.error(f"Failed to log job execution: {e}")
-        db.rollback()
+        logger.warning("Failed to broadcast usage update: %s", e)
+    
+    return results
 
 
 @celery_app.task(bind=True)
 def refresh_organization_usage_metrics(self, organization_id: str):
     """Refresh usage metrics for a specific organization."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "refresh_usage_metrics", organization_id, "started")
+        log_job_execution(job_logs, "refresh_usage_metrics", organization_id, "started")
         
         analytics_service = RealDataOrganizationAnalyticsService(db)
         
@@ -119,96 +224,82 @@ def refresh_organization_usage_metrics(self, organization_id: str):
             MetricTimeRange.LAST_90_DAYS
         ]
         
-        results = {}
-        for time_range in time_ranges:
-            try:
-                # Run analytics synchronously in background job
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                result = loop.run_until_complete(
-                    analytics_service.get_real_time_usage_metrics(
-                        organization_id=organization_id,
-                        time_range=time_range
-                    )
-                )
-                results[time_range.value] = "success"
-                loop.close()
-                
-            except Exception as e:
-                logger.error(f"Failed to refresh {time_range.value} metrics for org {organization_id}: {e}")
-                results[time_range.value] = f"error: {str(e)}"
+        # Skip time ranges whose cached metrics were computed recently
+        fresh_since = datetime.utcnow() - USAGE_CACHE_FRESHNESS
+        fresh_ranges = {
+            cached_range for (cached_range,) in db.query(OrganizationAnalyticsCache.time_range).filter(
+                OrganizationAnalyticsCache.organization_id == organization_id,
+                OrganizationAnalyticsCache.metric_type == "usage",
+                OrganizationAnalyticsCache.time_range.in_([tr.value for tr in time_ranges]),
+                OrganizationAnalyticsCache.created_at >= fresh_since,
+                OrganizationAnalyticsCache.is_stale == False
+            )
+        }
+        stale_ranges = [tr for tr in time_ranges if tr.value not in fresh_ranges]
         
-        # Broadcast update to connected clients
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            broadcaster = RealTimeAnalyticsBroadcaster(db)
-            loop.run_until_complete(broadcaster.broadcast_usage_update(organization_id))
-            loop.close()
-        except Exception as e:
-            logger.warning(f"Failed to broadcast usage update: {e}")
+        # Run the remaining time ranges and the broadcast on the shared event loop
+        refreshed = run_async(
+            _refresh_usage_metrics(db, analytics_service, organization_id, stale_ranges)
+        )
+        results = {tr.value: refreshed.get(tr.value, "fresh") for tr in time_ranges}
         
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "refresh_usage_metrics", organization_id, "completed",
+            job_logs, "refresh_usage_metrics", organization_id, "completed",
             {"results": results}, execution_time
         )
         
-        logger.info(f"Refreshed usage metrics for organization {organization_id}")
+        logger.info("Refreshed usage metrics for organization %s", organization_id)
         return {"organization_id": organization_id, "results": results}
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "refresh_usage_metrics", organization_id, "failed",
+            job_logs, "refresh_usage_metrics", organization_id, "failed",
             {"error": str(e)}, execution_time
         )
-        logger.error(f"Failed to refresh usage metrics for organization {organization_id}: {e}")
+        logger.error("Failed to refresh usage metrics for organization %s: %s", organization_id, e)
         raise self.retry(exc=e, countdown=60, max_retries=3)
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
 @celery_app.task(bind=True)
 def refresh_all_usage_metrics(self):
     """Refresh usage metrics for all active organizations."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "refresh_all_usage_metrics", status="started")
+        log_job_execution(job_logs, "refresh_all_usage_metrics", status="started")
         
-        # Get all active organizations
-        organizations = db.query(Organization).filter(
-            Organization.is_active == True
-        ).all()
-        
-        org_count = len(organizations)
-        logger.info(f"Starting usage metrics refresh for {org_count} organizations")
+        logger.info("Starting usage metrics refresh for active organizations")
         
+        org_count = 0
         success_count = 0
         error_count = 0
         
-        for org in organizations:
-            try:
-                # Queue individual organization refresh
-                # Using getattr to avoid type checker issues with Celery task methods
-                task_method = getattr(refresh_organization_usage_metrics, 'apply_async', None)
-                if task_method:
-                    task_method(args=[str(org.id)])
-                else:
-                    # Fallback: call directly if Celery not available
-                    refresh_organization_usage_metrics(self=None, organization_id=str(org.id))
-                success_count += 1
-                
-            except Exception as e:
-                logger.error(f"Failed to queue usage metrics refresh for org {org.id}: {e}")
-                error_count += 1
-        
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        # Stream active organization ids and queue each batch as one group,
+        # publishing every batch through the same pooled broker producer
+        with celery_app.producer_or_acquire() as producer:
+            for org_ids in iter_active_organization_ids(db):
+                org_count += len(org_ids)
+                try:
+                    refresh_jobs = group(
+                        refresh_organization_usage_metrics.s(org_id)
+                        for org_id in org_ids
+                    )
+                    refresh_jobs.apply_async(producer=producer)
+                    success_count += len(org_ids)
+                    
+                except Exception as e:
+                    logger.error("Failed to queue usage metrics refresh for %s organizations: %s", len(org_ids), e)
+                    error_count += len(org_ids)
+        
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         results = {
             "total_organizations": org_count,
             "success_count": success_count,
@@ -216,63 +307,60 @@ def refresh_all_usage_metrics(self):
         }
         
         log_job_execution(
-            db, "refresh_all_usage_metrics", status="completed",
+            job_logs, "refresh_all_usage_metrics", status="completed",
             details=results, execution_time_ms=execution_time
         )
         
-        logger.info(f"Queued usage metrics refresh for {success_count}/{org_count} organizations")
+        logger.info("Queued usage metrics refresh for %s/%s organizations", success_count, org_count)
         return results
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "refresh_all_usage_metrics", status="failed",
+            job_logs, "refresh_all_usage_metrics", status="failed",
             details={"error": str(e)}, execution_time_ms=execution_time
         )
-        logger.error(f"Failed to refresh all usage metrics: {e}")
+        logger.error("Failed to refresh all usage metrics: %s", e)
         raise self.retry(exc=e, countdown=300, max_retries=2)
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
 @celery_app.task(bind=True)
 def refresh_all_engagement_analytics(self):
     """Refresh engagement analytics for all active organizations."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "refresh_all_engagement_analytics", status="started")
-        
-        # Get all active organizations
-        organizations = db.query(Organization).filter(
-            Organization.is_active == True
-        ).all()
+        log_job_execution(job_logs, "refresh_all_engagement_analytics", status="started")
         
-        org_count = len(organizations)
-        logger.info(f"Starting engagement analytics refresh for {org_count} organizations")
+        logger.info("Starting engagement analytics refresh for active organizations")
         
         success_count = 0
         error_count = 0
+        analytics_service = RealDataOrganizationAnalyticsService(db)
         
-        for org in organizations:
+        for org_id in chain.from_iterable(iter_active_organization_ids(db)):
             try:
-                analytics_service = RealDataOrganizationAnalyticsService(db)
-                
                 # Note: Would call engagement analytics method here
                 # await analytics_service.get_user_engagement_analytics(
-                #     organization_id=str(org.id),
+                #     organization_id=org_id,
                 #     time_range=MetricTimeRange.LAST_30_DAYS
                 # )
                 
                 success_count += 1
                 
             except Exception as e:
-                logger.error(f"Failed to refresh engagement analytics for org {org.id}: {e}")
+                logger.error("Failed to refresh engagement analytics for org %s: %s", org_id, e)
                 error_count += 1
         
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        org_count = success_count + error_count
+        
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         results = {
             "total_organizations": org_count,
             "success_count": success_count,
@@ -280,60 +368,55 @@ def refresh_all_engagement_analytics(self):
         }
         
         log_job_execution(
-            db, "refresh_all_engagement_analytics", status="completed",
+            job_logs, "refresh_all_engagement_analytics", status="completed",
             details=results, execution_time_ms=execution_time
         )
         
-        logger.info(f"Refreshed engagement analytics for {success_count}/{org_count} organizations")
+        logger.info("Refreshed engagement analytics for %s/%s organizations", success_count, org_count)
         return results
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "refresh_all_engagement_analytics", status="failed",
+            job_logs, "refresh_all_engagement_analytics", status="failed",
             details={"error": str(e)}, execution_time_ms=execution_time
         )
-        logger.error(f"Failed to refresh all engagement analytics: {e}")
+        logger.error("Failed to refresh all engagement analytics: %s", e)
         raise self.retry(exc=e, countdown=300, max_retries=2)
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
 @celery_app.task(bind=True)
 def refresh_all_health_scores(self):
     """Refresh organization health scores."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "refresh_all_health_scores", status="started")
-        
-        # Get all active organizations
-        organizations = db.query(Organization).filter(
-            Organization.is_active == True
-        ).all()
+        log_job_execution(job_logs, "refresh_all_health_scores", status="started")
         
-        org_count = len(organizations)
-        logger.info(f"Starting health score refresh for {org_count} organizations")
+        logger.info("Starting health score refresh for active organizations")
         
         success_count = 0
         error_count = 0
         health_alerts = []
+        analytics_service = RealDataOrganizationAnalyticsService(db)
         
-        for org in organizations:
+        for org_id in chain.from_iterable(iter_active_organization_ids(db)):
             try:
-                analytics_service = RealDataOrganizationAnalyticsService(db)
-                
                 # Note: Would call health score calculation method here
                 # health_result = await analytics_service.get_organization_health_score(
-                #     organization_id=str(org.id)
+                #     organization_id=org_id
                 # )
                 
                 # Check for health score alerts
                 # if health_result.health_score < 50:  # Low health threshold
                 #     health_alerts.append({
-                #         "organization_id": str(org.id),
+                #         "organization_id": org_id,
                 #         "health_score": health_result.health_score,
                 #         "status": "critical" if health_result.health_score < 30 else "warning"
                 #     })
@@ -341,9 +424,11 @@ def refresh_all_health_scores(self):
                 success_count += 1
                 
             except Exception as e:
-                logger.error(f"Failed to refresh health score for org {org.id}: {e}")
+                logger.error("Failed to refresh health score for org %s: %s", org_id, e)
                 error_count += 1
         
+        org_count = success_count + error_count
+        
         # Send health alerts if any
         if health_alerts:
             try:
@@ -352,9 +437,9 @@ def refresh_all_health_scores(self):
                     # Note: Would broadcast health alerts
                     pass
             except Exception as e:
-                logger.warning(f"Failed to send health alerts: {e}")
+                logger.warning("Failed to send health alerts: %s", e)
         
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         results = {
             "total_organizations": org_count,
             "success_count": success_count,
@@ -363,103 +448,158 @@ def refresh_all_health_scores(self):
         }
         
         log_job_execution(
-            db, "refresh_all_health_scores", status="completed",
+            job_logs, "refresh_all_health_scores", status="completed",
             details=results, execution_time_ms=execution_time
         )
         
-        logger.info(f"Refreshed health scores for {success_count}/{org_count} organizations")
+        logger.info("Refreshed health scores for %s/%s organizations", success_count, org_count)
         return results
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "refresh_all_health_scores", status="failed",
+            job_logs, "refresh_all_health_scores", status="failed",
             details={"error": str(e)}, execution_time_ms=execution_time
         )
-        logger.error(f"Failed to refresh all health scores: {e}")
+        logger.error("Failed to refresh all health scores: %s", e)
         raise self.retry(exc=e, countdown=600, max_retries=2)
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
 @celery_app.task
 def cleanup_expired_cache():
     """Clean up expired analytics cache entries."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
+    now = datetime.utcnow()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "cleanup_expired_cache", status="started")
+        log_job_execution(job_logs, "cleanup_expired_cache", status="started")
         
-        # Delete expired cache entries
-        expired_count = db.query(OrganizationAnalyticsCache).filter(
-            OrganizationAnalyticsCache.expires_at < datetime.utcnow()
-        ).delete()
+        # Delete expired cache entries (expires_at is naive UTC, so compare
+        # against the database clock in UTC)
+        expired_count = delete_in_batches(
+            db, OrganizationAnalyticsCache,
+            OrganizationAnalyticsCache.expires_at < func.timezone('utc', func.now())
+        )
         
         # Delete old job logs (keep only last 30 days)
-        old_logs_cutoff = datetime.utcnow() - timedelta(days=30)
-        old_logs_count = db.query(AnalyticsJobLog).filter(
+        old_logs_cutoff = now - timedelta(days=30)
+        old_logs_count = delete_in_batches(
+            db, AnalyticsJobLog,
             AnalyticsJobLog.created_at < old_logs_cutoff
-        ).delete()
+        )
         
-        db.commit()
+        # Cached statistics still count the deleted entries
+        redis_client.delete(CACHE_STATISTICS_KEY)
         
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         results = {
             "expired_cache_deleted": expired_count,
             "old_logs_deleted": old_logs_count
         }
         
         log_job_execution(
-            db, "cleanup_expired_cache", status="completed",
+            job_logs, "cleanup_expired_cache", status="completed",
             details=results, execution_time_ms=execution_time
         )
         
-        logger.info(f"Cleaned up {expired_count} expired cache entries and {old_logs_count} old logs")
+        logger.info("Cleaned up %s expired cache entries and %s old logs", expired_count, old_logs_count)
         return results
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "cleanup_expired_cache", status="failed",
+            job_logs, "cleanup_expired_cache", status="failed",
             details={"error": str(e)}, execution_time_ms=execution_time
         )
-        logger.error(f"Failed to cleanup expired cache: {e}")
+        logger.error("Failed to cleanup expired cache: %s", e)
+        db.rollback()
+        raise
+        
+    finally:
+        flush_job_logs(db, job_logs)
+        db.close()
+
+
+@celery_app.task
+def refresh_dashboard_snapshot_view():
+    """Refresh the dashboard snapshot materialized view read by dashboard refreshes."""
+    start_time = time.perf_counter()
+    db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
+    
+    try:
+        refresh_materialized_view(db, DASHBOARD_SNAPSHOT_VIEW)
+        
+        execution_time = int((time.perf_counter() - start_time) * 1000)
+        log_job_execution(
+            job_logs, "refresh_dashboard_snapshot_view", status="completed",
+            execution_time_ms=execution_time
+        )
+        return {"status": "completed", "execution_time_ms": execution_time}
+        
+    except Exception as e:
         db.rollback()
+        execution_time = int((time.perf_counter() - start_time) * 1000)
+        log_job_execution(
+            job_logs, "refresh_dashboard_snapshot_view", status="failed",
+            details={"error": str(e)}, execution_time_ms=execution_time
+        )
+        logger.error("Failed to refresh dashboard snapshot view: %s", e)
         raise
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
 @celery_app.task
 def analytics_system_health_check():
     """Perform system health check for analytics."""
-    start_time = datetime.utcnow()
+    start_time = time.perf_counter()
+    now = datetime.utcnow()
     db = get_db_session()
+    job_logs: List[Dict[str, Any]] = []
     
     try:
-        log_job_execution(db, "analytics_system_health_check", status="started")
-        
-        # Check analytics cache health
-        total_cache_entries = db.query(OrganizationAnalyticsCache).count()
-        expired_entries = db.query(OrganizationAnalyticsCache).filter(
-            OrganizationAnalyticsCache.expires_at < datetime.utcnow()
-        ).count()
+        log_job_execution(job_logs, "analytics_system_health_check", status="started")
+        
+        # Check analytics cache health (total, expired and hit entries and the
+        # average hits per entry in one scan); lambda_stmt caches the built statement
+        total_cache_entries, expired_entries, cache_with_hits, avg_cache_hits = db.execute(lambda_stmt(
+            lambda: select(
+                func.count(OrganizationAnalyticsCache.id),
+                func.count(OrganizationAnalyticsCache.id).filter(
+                    OrganizationAnalyticsCache.expires_at < func.timezone('utc', func.now())
+                ),
+                func.count(OrganizationAnalyticsCache.id).filter(
+                    OrganizationAnalyticsCache.cache_hit_count > 0
+                ),
+                func.avg(OrganizationAnalyticsCache.cache_hit_count)
+            )
+        )).one()
         
         # Check recent job failures
-        recent_cutoff = datetime.utcnow() - timedelta(hours=1)
+        recent_cutoff = now - timedelta(hours=1)
         recent_failures = db.query(AnalyticsJobLog).filter(
             AnalyticsJobLog.created_at >= recent_cutoff,
             AnalyticsJobLog.status == "failed"
         ).count()
         
-        # Calculate cache hit rate
-        cache_with_hits = db.query(OrganizationAnalyticsCache).filter(
-            OrganizationAnalyticsCache.cache_hit_count > 0
-        ).count()
-        cache_hit_rate = (cache_with_hits / total_cache_entries * 100) if total_cache_entries > 0 else 0
+        # Calculate cache hit rate from the lookups counted since the last check,
+        # falling back to the share of entries with hits if there were none
+        cache_stats = redis_client.pop_hash(CACHE_STATS_KEY) or {}
+        cache_hits = int(cache_stats.get("hits", 0))
+        cache_lookups = cache_hits + int(cache_stats.get("misses", 0))
+        if cache_lookups > 0:
+            cache_hit_rate = cache_hits / cache_lookups * 100
+        else:
+            cache_hit_rate = (cache_with_hits / total_cache_entries * 100) if total_cache_entries > 0 else 0
         
         # Determine system health status
         health_issues = []
@@ -474,38 +614,40 @@ def analytics_system_health_check():
         
         system_status = "healthy" if not health_issues else "warning"
         
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         results = {
             "status": system_status,
             "total_cache_entries": total_cache_entries,
             "expired_entries": expired_entries,
             "recent_failures": recent_failures,
             "cache_hit_rate": cache_hit_rate,
+            "avg_cache_hits": float(avg_cache_hits or 0),
             "health_issues": health_issues
         }
         
         log_job_execution(
-            db, "analytics_system_health_check", status="completed",
+            job_logs, "analytics_system_health_check", status="completed",
             details=results, execution_time_ms=execution_time
         )
         
         if health_issues:
-            logger.warning(f"Analytics system health check found issues: {health_issues}")
+            logger.warning("Analytics system health check found issues: %s", health_issues)
         else:
             logger.info("Analytics system health check passed")
         
         return results
         
     except Exception as e:
-        execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        execution_time = int((time.perf_counter() - start_time) * 1000)
         log_job_execution(
-            db, "analytics_system_health_check", status="failed",
+            job_logs, "analytics_system_health_check", status="failed",
             details={"error": str(e)}, execution_time_ms=execution_time
         )
-        logger.error(f"Analytics system health check failed: {e}")
+        logger.error("Analytics system health check failed: %s", e)
         raise
         
     finally:
+        flush_job_logs(db, job_logs)
         db.close()
 
 
@@ -523,6 +665,12 @@ def trigger_organization_refresh(organization_id: str):
 
 def trigger_full_system_refresh():
     """Manually trigger full system analytics refresh."""
+    # Ignore repeat triggers while a full refresh is still fanning out; without
+    # Redis the lock cannot be taken, so let the refresh through
+    if redis_client.set_nx(FULL_REFRESH_LOCK_KEY, "1", expire=FULL_REFRESH_LOCK_TTL) is False:
+        logger.info("Full system analytics refresh already running, skipping")
+        return {"status": "already_running"}
+    
     tasks = []
     
     # Get delay methods with fallbacks
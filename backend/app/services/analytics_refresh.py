@@ -7,330 +7,410 @@ Simple service for refreshing analytics data without Celery complexity:
 - Cache management functions
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Union
 from datetime import datetime, timedelta
 import logging
 import asyncio
+import time
+from contextlib import contextmanager
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.cache import redis_client
+from app.core.config import settings
 from app.db.session import SessionLocal
-from app.models.organization import Organization
+from app.db.utils import delete_in_batches
+from app.models.organization import Organization, OrganizationStatus
 from app.models.analytics_cache import AnalyticsJobLog, OrganizationAnalyticsCache
+from app.services.analytics_job_log import log_job_execution, flush_job_logs
 from app.services.real_data_analytics import RealDataOrganizationAnalyticsService
 from app.services.websocket_analytics import RealTimeAnalyticsBroadcaster
 from app.schemas.organization_analytics import MetricTimeRange
 
 logger = logging.getLogger(__name__)
 
+# Organization ids streamed (and refreshed concurrently) per batch by the refresh-all path
+ORGANIZATION_BATCH_SIZE = 500
+
+# get_cache_statistics results, dropped whenever cache entries are removed or invalidated
+CACHE_STATISTICS_KEY = "analytics:cache_stats:global"
+CACHE_STATISTICS_TTL = 60  # seconds
+
+# Failed organizations recorded in a refresh-all job log entry
+LOG_SAMPLE_ERRORS = 20
+
+# Time ranges refreshed when the caller does not ask for specific ones
+DEFAULT_USAGE_TIME_RANGES = [
+    MetricTimeRange.LAST_7_DAYS,
+    MetricTimeRange.LAST_30_DAYS,
+    MetricTimeRange.LAST_90_DAYS
+]
+
 
 class AnalyticsRefreshService:
     """Service for refreshing and managing analytics data."""
     
     def __init__(self):
         self.db_session = SessionLocal
+        # Running per-organization refreshes, joined by concurrent callers
+        self._inflight_refreshes: Dict[tuple, asyncio.Task] = {}
     
-    def get_db(self) -> Session:
-        """Get database session."""
-        return self.db_session()
-    
-    def log_operation(
-        self,
-        db: Session,
-        operation: str,
-        organization_id: Optional[str] = None,
-        status: str = "started",
-        details: Optional[Dict[str, Any]] = None,
-        execution_time_ms: Optional[int] = None
-    ):
-        """Log analytics operation for monitoring."""
+    @contextmanager
+    def session(self) -> Iterator[Session]:
+        """Provide a database session that is closed on exit."""
+        db = self.db_session()
         try:
-            job_log = AnalyticsJobLog(
-                job_name=operation,
-                organization_id=organization_id,
-                status=status,
-                execution_details=details or {},
-                execution_time_ms=execution_time_ms
-            )
-            db.add(job_log)
-            db.commit()
-            
-        except Exception as e:
-            logger.error(f"Failed to log operation: {e}")
-            db.rollback()
+            yield db
+        finally:
+            db.close()
     
     async def refresh_organization_usage_metrics(
         self, 
         organization_id: str,
         time_ranges: Optional[List[MetricTimeRange]] = None
     ) -> Dict[str, Any]:
-        """Refresh usage metrics for a specific organization."""
-        start_time = datetime.utcnow()
-        db = self.get_db()
+        """
+        Refresh usage metrics for a specific organization.
         
-        try:
-            self.log_operation(db, "refresh_usage_metrics", organization_id, "started")
-            
-            analytics_service = RealDataOrganizationAnalyticsService(db)
-            
-            # Default time ranges if not specified
-            if time_ranges is None:
-                time_ranges = [
-                    MetricTimeRange.LAST_7_DAYS,
-                    MetricTimeRange.LAST_30_DAYS,
-                    MetricTimeRange.LAST_90_DAYS
-                ]
-            
-            results = {}
-            for time_range in time_ranges:
+        A caller that asks for a refresh already running for the same organization
+        and time ranges awaits that refresh instead of starting another one.
+        """
+        # Default time ranges if not specified
+        if time_ranges is None:
+            time_ranges = DEFAULT_USAGE_TIME_RANGES
+        
+        key = (organization_id, tuple(time_range.value for time_range in time_ranges))
+        task = self._inflight_refreshes.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(
+                self._refresh_organization_usage_metrics(organization_id, time_ranges)
+            )
+            self._inflight_refreshes[key] = task
+            task.add_done_callback(lambda done: self._forget_refresh(key, done))
+        
+        # Shielded so one cancelled caller does not cancel the refresh for the others
+        return await asyncio.shield(task)
+    
+    def _forget_refresh(self, key: tuple, task: asyncio.Task):
+        """Drop a finished refresh from the in-flight map."""
+        if self._inflight_refreshes.get(key) is task:
+            del self._inflight_refreshes[key]
+    
+    async def _refresh_organization_usage_metrics(
+        self,
+        organization_id: str,
+        time_ranges: List[MetricTimeRange]
+    ) -> Dict[str, Any]:
+        """Run a usage metrics refresh for one organization."""
+        start_time = time.perf_counter()
+        job_logs: List[Dict[str, Any]] = []
+        
+        with self.session() as db:
+            try:
+                log_job_execution(job_logs, "refresh_usage_metrics", organization_id, "started")
+                
+                # The queries block, so they run in a worker thread; organizations
+                # refreshed concurrently then overlap their database work
+                results = await asyncio.to_thread(
+                    self._compute_usage_ranges, db, organization_id, time_ranges
+                )
+                
+                # Broadcast update to connected clients
                 try:
-                    result = await analytics_service.get_real_time_usage_metrics(
-                        organization_id=organization_id,
-                        time_range=time_range
-                    )
-                    results[time_range.value] = {
-                        "status": "success",
-                        "total_sessions": result.usage_metrics.total_sessions,
-                        "total_minutes": result.usage_metrics.total_minutes_listened,
-                        "unique_users": result.usage_metrics.unique_active_users
-                    }
-                    
+                    broadcaster = RealTimeAnalyticsBroadcaster(db)
+                    await broadcaster.broadcast_usage_update(organization_id)
                 except Exception as e:
-                    logger.error(f"Failed to refresh {time_range.value} metrics for org {organization_id}: {e}")
-                    results[time_range.value] = {
-                        "status": "error",
-                        "error": str(e)
-                    }
-            
-            # Broadcast update to connected clients
+                    logger.warning("Failed to broadcast update: %s", e)
+                
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                log_job_execution(
+                    job_logs, "refresh_usage_metrics", organization_id, "completed",
+                    {"results": results}, execution_time
+                )
+                
+                logger.info("Refreshed usage metrics for organization %s", organization_id)
+                return {
+                    "organization_id": organization_id,
+                    "execution_time_ms": execution_time,
+                    "results": results
+                }
+                
+            except Exception as e:
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                log_job_execution(
+                    job_logs, "refresh_usage_metrics", organization_id, "failed",
+                    {"error": str(e)}, execution_time
+                )
+                logger.error("Failed to refresh usage metrics for organization %s: %s", organization_id, e)
+                raise
+            
+            finally:
+                flush_job_logs(db, job_logs)
+    
+    def _compute_usage_ranges(
+        self,
+        db: Session,
+        organization_id: str,
+        time_ranges: List[MetricTimeRange]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Compute and cache an organization's usage metrics for each time range."""
+        analytics_service = RealDataOrganizationAnalyticsService(db)
+        results = {}
+        for time_range in time_ranges:
             try:
-                broadcaster = RealTimeAnalyticsBroadcaster(db)
-                await broadcaster.broadcast_usage_update(organization_id)
+                result = analytics_service.compute_real_time_usage_metrics(
+                    organization_id=organization_id,
+                    time_range=time_range
+                )
             except Exception as e:
-                logger.warning(f"Failed to broadcast update: {e}")
-            
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.log_operation(
-                db, "refresh_usage_metrics", organization_id, "completed",
-                {"results": results}, execution_time
-            )
-            
-            logger.info(f"Refreshed usage metrics for organization {organization_id}")
-            return {
-                "organization_id": organization_id,
-                "execution_time_ms": execution_time,
-                "results": results
+                logger.error("Failed to refresh %s metrics for org %s: %s", time_range.value, organization_id, e)
+                results[time_range.value] = {
+                    "status": "error",
+                    "error": str(e)
+                }
+                continue
+            
+            results[time_range.value] = {
+                "status": "success",
+                "total_sessions": result.usage_metrics.total_sessions,
+                "total_minutes": result.usage_metrics.total_minutes_listened,
+                "unique_users": result.usage_metrics.unique_active_users
             }
-            
-        except Exception as e:
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.log_operation(
-                db, "refresh_usage_metrics", organization_id, "failed",
-                {"error": str(e)}, execution_time
-            )
-            logger.error(f"Failed to refresh usage metrics for organization {organization_id}: {e}")
-            raise
-            
-        finally:
-            db.close()
+        return results
     
     async def refresh_all_organizations_usage_metrics(self) -> Dict[str, Any]:
         """Refresh usage metrics for all active organizations."""
-        start_time = datetime.utcnow()
-        db = self.get_db()
-        
-        try:
-            self.log_operation(db, "refresh_all_usage_metrics", status="started")
-            
-            # Get all active organizations
-            organizations = db.query(Organization).filter(
-                Organization.is_active == True
-            ).all()
-            
-            org_count = len(organizations)
-            logger.info(f"Starting usage metrics refresh for {org_count} organizations")
-            
-            results = []
-            success_count = 0
-            error_count = 0
-            
-            for org in organizations:
-                try:
-                    org_result = await self.refresh_organization_usage_metrics(str(org.id))
-                    results.append(org_result)
-                    success_count += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to refresh metrics for org {org.id}: {e}")
-                    results.append({
-                        "organization_id": str(org.id),
-                        "status": "error",
-                        "error": str(e)
-                    })
-                    error_count += 1
-            
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            summary = {
-                "total_organizations": org_count,
-                "success_count": success_count,
-                "error_count": error_count,
-                "execution_time_ms": execution_time,
-                "results": results
-            }
-            
-            self.log_operation(
-                db, "refresh_all_usage_metrics", status="completed",
-                details=summary, execution_time_ms=execution_time
-            )
-            
-            logger.info(f"Completed usage metrics refresh: {success_count}/{org_count} successful")
-            return summary
-            
-        except Exception as e:
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.log_operation(
-                db, "refresh_all_usage_metrics", status="failed",
-                details={"error": str(e)}, execution_time_ms=execution_time
-            )
-            logger.error(f"Failed to refresh all usage metrics: {e}")
-            raise
-            
-        finally:
-            db.close()
+        start_time = time.perf_counter()
+        job_logs: List[Dict[str, Any]] = []
+        with self.session() as db:
+            try:
+                log_job_execution(job_logs, "refresh_all_usage_metrics", status="started")
+                
+                logger.info("Starting usage metrics refresh for active organizations")
+                
+                # Stream active organization ids; organizations have no is_active
+                # flag, so trial and active subscriptions count
+                org_id_batches = db.execute(
+                    select(Organization.id)
+                    .where(Organization.subscription_status.in_([
+                        OrganizationStatus.TRIAL.value,
+                        OrganizationStatus.ACTIVE.value
+                    ]))
+                    .execution_options(yield_per=ORGANIZATION_BATCH_SIZE)
+                ).scalars().partitions()
+                
+                # Each refresh computes, caches and broadcasts an organization's usage
+                # metrics in a session of its own, so organizations of a batch can be
+                # refreshed concurrently and commits cannot close the cursor
+                semaphore = asyncio.Semaphore(settings.ANALYTICS_REFRESH_CONCURRENCY)
+                
+                async def refresh_one(org_id: str) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await self.refresh_organization_usage_metrics(org_id)
+                
+                results = []
+                for batch in org_id_batches:
+                    org_ids = [str(org_id) for org_id in batch]
+                    outcomes = await asyncio.gather(
+                        *(refresh_one(org_id) for org_id in org_ids),
+                        return_exceptions=True
+                    )
+                    for org_id, outcome in zip(org_ids, outcomes):
+                        if isinstance(outcome, BaseException):
+                            logger.error("Failed to refresh metrics for org %s: %s", org_id, outcome)
+                            results.append({
+                                "organization_id": org_id,
+                                "status": "error",
+                                "error": str(outcome)
+                            })
+                        else:
+                            results.append(outcome)
+                
+                org_count = len(results)
+                error_count = sum(1 for result in results if result.get("status") == "error")
+                success_count = org_count - error_count
+                
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                summary = {
+                    "total_organizations": org_count,
+                    "success_count": success_count,
+                    "error_count": error_count,
+                    "execution_time_ms": execution_time,
+                    "results": results
+                }
+                
+                # Per-organization results go to the caller only; the job log keeps
+                # the counts and a few of the errors
+                log_summary = {
+                    key: value for key, value in summary.items() if key != "results"
+                }
+                log_summary["sample_errors"] = [
+                    result for result in results if result.get("status") == "error"
+                ][:LOG_SAMPLE_ERRORS]
+                
+                log_job_execution(
+                    job_logs, "refresh_all_usage_metrics", status="completed",
+                    details=log_summary, execution_time_ms=execution_time
+                )
+                
+                logger.info("Completed usage metrics refresh: %s/%s successful", success_count, org_count)
+                return summary
+                
+            except Exception as e:
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                log_job_execution(
+                    job_logs, "refresh_all_usage_metrics", status="failed",
+                    details={"error": str(e)}, execution_time_ms=execution_time
+                )
+                logger.error("Failed to refresh all usage metrics: %s", e)
+                raise
+            
+            finally:
+                flush_job_logs(db, job_logs)
     
     def cleanup_expired_cache(self) -> Dict[str, Any]:
         """Clean up expired analytics cache entries."""
-        start_time = datetime.utcnow()
-        db = self.get_db()
-        
-        try:
-            self.log_operation(db, "cleanup_expired_cache", status="started")
-            
-            # Delete expired cache entries
-            expired_count = db.query(OrganizationAnalyticsCache).filter(
-                OrganizationAnalyticsCache.expires_at < datetime.utcnow()
-            ).delete()
-            
-            # Delete old job logs (keep only last 30 days)
-            old_logs_cutoff = datetime.utcnow() - timedelta(days=30)
-            old_logs_count = db.query(AnalyticsJobLog).filter(
-                AnalyticsJobLog.created_at < old_logs_cutoff
-            ).delete()
-            
-            db.commit()
-            
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            results = {
-                "expired_cache_deleted": expired_count,
-                "old_logs_deleted": old_logs_count,
-                "execution_time_ms": execution_time
-            }
-            
-            self.log_operation(
-                db, "cleanup_expired_cache", status="completed",
-                details=results, execution_time_ms=execution_time
-            )
-            
-            logger.info(f"Cleaned up {expired_count} expired cache entries and {old_logs_count} old logs")
-            return results
-            
-        except Exception as e:
-            execution_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
-            self.log_operation(
-                db, "cleanup_expired_cache", status="failed",
-                details={"error": str(e)}, execution_time_ms=execution_time
-            )
-            logger.error(f"Failed to cleanup expired cache: {e}")
-            db.rollback()
-            raise
-            
-        finally:
-            db.close()
+        start_time = time.perf_counter()
+        now = datetime.utcnow()
+        job_logs: List[Dict[str, Any]] = []
+        with self.session() as db:
+            try:
+                log_job_execution(job_logs, "cleanup_expired_cache", status="started")
+                
+                # Delete expired cache entries (expires_at is naive UTC, so compare
+                # against the database clock in UTC, as the Celery task does)
+                expired_count = delete_in_batches(
+                    db, OrganizationAnalyticsCache,
+                    OrganizationAnalyticsCache.expires_at < func.timezone('utc', func.now())
+                )
+                
+                # Delete old job logs (keep only last 30 days)
+                old_logs_cutoff = now - timedelta(days=30)
+                old_logs_count = delete_in_batches(
+                    db, AnalyticsJobLog, AnalyticsJobLog.created_at < old_logs_cutoff
+                )
+                
+                redis_client.delete(CACHE_STATISTICS_KEY)
+                
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                results = {
+                    "expired_cache_deleted": expired_count,
+                    "old_logs_deleted": old_logs_count,
+                    "execution_time_ms": execution_time
+                }
+                
+                log_job_execution(
+                    job_logs, "cleanup_expired_cache", status="completed",
+                    details=results, execution_time_ms=execution_time
+                )
+                
+                logger.info("Cleaned up %s expired cache entries and %s old logs", expired_count, old_logs_count)
+                return results
+                
+            except Exception as e:
+                execution_time = int((time.perf_counter() - start_time) * 1000)
+                log_job_execution(
+                    job_logs, "cleanup_expired_cache", status="failed",
+                    details={"error": str(e)}, execution_time_ms=execution_time
+                )
+                logger.error("Failed to cleanup expired cache: %s", e)
+                db.rollback()
+                raise
+            
+            finally:
+                flush_job_logs(db, job_logs)
     
     def get_cache_statistics(self) -> Dict[str, Any]:
-        """Get analytics cache statistics."""
-        db = self.get_db()
+        """Get analytics cache statistics, cached in Redis for a short time."""
+        cached_stats = redis_client.get_json(CACHE_STATISTICS_KEY)
+        if isinstance(cached_stats, dict):
+            return cached_stats
         
-        try:
-            # Cache statistics
-            total_cache_entries = db.query(OrganizationAnalyticsCache).count()
-            expired_entries = db.query(OrganizationAnalyticsCache).filter(
-                OrganizationAnalyticsCache.expires_at < datetime.utcnow()
-            ).count()
-            
-            # Cache hit statistics
-            cache_with_hits = db.query(OrganizationAnalyticsCache).filter(
-                OrganizationAnalyticsCache.cache_hit_count > 0
-            ).count()
-            
-            # Recent job statistics
-            recent_cutoff = datetime.utcnow() - timedelta(hours=24)
-            recent_jobs = db.query(AnalyticsJobLog).filter(
-                AnalyticsJobLog.created_at >= recent_cutoff
-            ).count()
-            
-            recent_failures = db.query(AnalyticsJobLog).filter(
-                AnalyticsJobLog.created_at >= recent_cutoff,
-                AnalyticsJobLog.status == "failed"
-            ).count()
-            
-            cache_hit_rate = (cache_with_hits / total_cache_entries * 100) if total_cache_entries > 0 else 0
-            failure_rate = (recent_failures / recent_jobs * 100) if recent_jobs > 0 else 0
-            
-            return {
-                "cache_statistics": {
-                    "total_entries": total_cache_entries,
-                    "expired_entries": expired_entries,
-                    "entries_with_hits": cache_with_hits,
-                    "hit_rate_percentage": round(cache_hit_rate, 2)
-                },
-                "job_statistics": {
-                    "recent_jobs_24h": recent_jobs,
-                    "recent_failures_24h": recent_failures,
-                    "failure_rate_percentage": round(failure_rate, 2)
-                },
-                "generated_at": datetime.utcnow().isoformat()
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to get cache statistics: {e}")
-            raise
-            
-        finally:
-            db.close()
+        with self.session() as db:
+            try:
+                now = datetime.utcnow()
+                
+                # Cache statistics (total, expired and hit entries in one scan)
+                total_cache_entries, expired_entries, cache_with_hits = db.query(
+                    func.count(OrganizationAnalyticsCache.id),
+                    func.count(OrganizationAnalyticsCache.id).filter(
+                        OrganizationAnalyticsCache.expires_at < now
+                    ),
+                    func.count(OrganizationAnalyticsCache.id).filter(
+                        OrganizationAnalyticsCache.cache_hit_count > 0
+                    )
+                ).one()
+                
+                # Recent job statistics
+                recent_cutoff = now - timedelta(hours=24)
+                recent_jobs, recent_failures = db.query(
+                    func.count(AnalyticsJobLog.id),
+                    func.count(AnalyticsJobLog.id).filter(AnalyticsJobLog.status == "failed")
+                ).filter(
+                    AnalyticsJobLog.created_at >= recent_cutoff
+                ).one()
+                
+                cache_hit_rate = (cache_with_hits / total_cache_entries * 100) if total_cache_entries > 0 else 0
+                failure_rate = (recent_failures / recent_jobs * 100) if recent_jobs > 0 else 0
+                
+                stats = {
+                    "cache_statistics": {
+                        "total_entries": total_cache_entries,
+                        "expired_entries": expired_entries,
+                        "entries_with_hits": cache_with_hits,
+                        "hit_rate_percentage": round(cache_hit_rate, 2)
+                    },
+                    "job_statistics": {
+                        "recent_jobs_24h": recent_jobs,
+                        "recent_failures_24h": recent_failures,
+                        "failure_rate_percentage": round(failure_rate, 2)
+                    },
+                    "generated_at": now.isoformat()
+                }
+                
+                redis_client.set_json(CACHE_STATISTICS_KEY, stats, expire=CACHE_STATISTICS_TTL)
+                return stats
+                
+            except Exception as e:
+                logger.error("Failed to get cache statistics: %s", e)
+                raise
     
-    def invalidate_organization_cache(self, organization_id: str, metric_types: Optional[List[str]] = None):
-        """Invalidate cached analytics for an organization."""
-        db = self.get_db()
-        
-        try:
-            query = db.query(OrganizationAnalyticsCache).filter(
-                OrganizationAnalyticsCache.organization_id == organization_id
-            )
-            
-            if metric_types:
-                query = query.filter(OrganizationAnalyticsCache.metric_type.in_(metric_types))
-            
-            invalidated_count = query.update({
-                "is_stale": True,
-                "invalidated_at": datetime.utcnow()
-            })
-            
-            db.commit()
-            
-            logger.info(f"Invalidated {invalidated_count} cache entries for organization {organization_id}")
-            return {
-                "organization_id": organization_id,
-                "invalidated_count": invalidated_count,
-                "metric_types": metric_types or "all"
-            }
-            
-        except Exception as e:
-            logger.error(f"Error invalidating cache: {e}")
-            db.rollback()
-            raise
-            
-        finally:
-            db.close()
+    def invalidate_organization_cache(
+        self,
+        organization_id: Union[str, List[str]],
+        metric_types: Optional[List[str]] = None
+    ):
+        """Invalidate cached analytics for one organization, or several in one UPDATE."""
+        with self.session() as db:
+            try:
+                if isinstance(organization_id, list):
+                    org_filter = OrganizationAnalyticsCache.organization_id.in_(organization_id)
+                else:
+                    org_filter = OrganizationAnalyticsCache.organization_id == organization_id
+                query = db.query(OrganizationAnalyticsCache).filter(org_filter)
+                
+                if metric_types:
+                    query = query.filter(OrganizationAnalyticsCache.metric_type.in_(metric_types))
+                
+                invalidated_count = query.update({
+                    "is_stale": True,
+                    "invalidated_at": datetime.utcnow()
+                }, synchronize_session=False)
+                
+                db.commit()
+                redis_client.delete(CACHE_STATISTICS_KEY)
+                
+                logger.info("Invalidated %s cache entries for organization %s", invalidated_count, organization_id)
+                return {
+                    "organization_id": organization_id,
+                    "invalidated_count": invalidated_count,
+                    "metric_types": metric_types or "all"
+                }
+                
+            except Exception as e:
+                logger.error("Error invalidating cache: %s", e)
+                db.rollback()
+                raise
 
 
 # Global service instance
@@ -6,16 +6,34 @@ Handles user creation, management, and synchronization with Authentik
 import asyncio
 import logging
 import os
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, List, Optional, Any, Tuple
 import httpx
+import orjson
 from pydantic import BaseModel
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # Configuration from environment
 AUTHENTIK_BASE_URL = os.getenv("AUTHENTIK_BASE_URL", "https://authentik.elefefe.eu")
 AUTHENTIK_API_TOKEN = os.getenv("AUTHENTIK_API_TOKEN")  # Service account token
 
+# Upper bound on in-flight Authentik API requests, to stay within its rate limits
+AUTHENTIK_MAX_CONCURRENT_REQUESTS = int(os.getenv("AUTHENTIK_MAX_CONCURRENT_REQUESTS", "10"))
+_request_semaphore = asyncio.Semaphore(AUTHENTIK_MAX_CONCURRENT_REQUESTS)
+
+# Groups rarely change, so name lookups are cached in-process for a few minutes
+GROUP_CACHE_TTL = 300  # seconds
+
+# A successful token validation is trusted for this long before checking again
+TOKEN_VALIDATION_TTL = 60  # seconds
+
 
 class AuthentikUser(BaseModel):
     """Authentik user model"""
@@ -46,6 +64,9 @@ class AuthentikAPIError(Exception):
 class AuthentikService:
     """Service for interacting with Authentik API"""
     
+    # Page size for list endpoints (Authentik defaults to 20 per page)
+    _DEFAULT_PAGE_SIZE = 200
+    
     def __init__(self):
         self.base_url = AUTHENTIK_BASE_URL.rstrip('/')
         self.api_base = f"{self.base_url}/api/v3"
@@ -56,6 +77,37 @@ class AuthentikService:
         
         if not self.api_token:
             logger.warning("No Authentik API token configured. User creation will be disabled.")
+        
+        # Shared client, created on first use so connections are kept alive between calls
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # group name -> (fetched at, group data)
+        self._group_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        
+        # monotonic time of the last successful validate_api_token call
+        self._token_validated_at: Optional[float] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.api_base}/",
+                timeout=self.timeout,
+                headers={
+                    "Authorization": f"Bearer {self.api_token}",
+                    "Content-Type": "application/json",
+                    "Accept": "application/json"
+                },
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                http2=HTTP2_AVAILABLE
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def _make_request(
         self, 
@@ -69,38 +121,31 @@ class AuthentikService:
         if not self.api_token:
             raise AuthentikAPIError("No Authentik API token configured")
         
-        url = f"{self.api_base}/{endpoint.lstrip('/')}"
-        headers = {
-            "Authorization": f"Bearer {self.api_token}",
-            "Content-Type": "application/json",
-            "Accept": "application/json"
-        }
-        
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            client = await self._get_client()
+            async with _request_semaphore:
                 response = await client.request(
                     method=method,
-                    url=url,
-                    json=data if data else None,
-                    params=params if params else None,
-                    headers=headers
+                    url=endpoint.lstrip('/'),
+                    content=orjson.dumps(data) if data else None,
+                    params=params if params else None
                 )
+            
+            if response.status_code >= 400:
+                error_detail = response.text
+                try:
+                    error_json = orjson.loads(response.content)
+                    error_detail = error_json.get('detail', error_detail)
+                except:
+                    pass
                 
-                if response.status_code >= 400:
-                    error_detail = response.text
-                    try:
-                        error_json = response.json()
-                        error_detail = error_json.get('detail', error_detail)
-                    except:
-                        pass
-                    
-                    logger.error(f"Authentik API error {response.status_code}: {error_detail}")
-                    raise AuthentikAPIError(f"API request failed: {error_detail}")
-                
-                return response.json() if response.content else {}
-                
+                logger.error("Authentik API error %s: %s", response.status_code, error_detail)
+                raise AuthentikAPIError(f"API request failed: {error_detail}")
+            
+            return orjson.loads(response.content) if response.content else {}
+            
         except httpx.RequestError as e:
-            logger.error(f"Request to Authentik API failed: {e}")
+            logger.error("Request to Authentik API failed: %s", e)
             raise AuthentikAPIError(f"Request failed: {str(e)}")
     
     async def validate_api_token(self) -> bool:
@@ -108,19 +153,24 @@ class AuthentikService:
         Validate the API token by making a simple API call
         Returns True if token is valid, False otherwise
         """
+        now = time.monotonic()
+        if self._token_validated_at is not None and now - self._token_validated_at < TOKEN_VALIDATION_TTL:
+            return True
+        
         try:
-            # Try a simple API call to validate the token
-            await self._make_request("GET", "/core/users/")
+            # Try a simple API call to validate the token (one user is enough)
+            await self._make_request("GET", "/core/users/", params={"page_size": 1})
+            self._token_validated_at = now
             return True
         except AuthentikAPIError as e:
             if "Token invalid/expired" in str(e):
                 logger.warning("Authentik API token is expired or invalid")
                 return False
             # Other API errors don't necessarily mean the token is invalid
-            logger.error(f"API token validation failed: {e}")
+            logger.error("API token validation failed: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Unexpected error during token validation: {e}")
+            logger.error("Unexpected error during token validation: %s", e)
             return False
     
     async def create_user(
@@ -165,7 +215,7 @@ class AuthentikService:
                 user_data["attributes"] = attributes
             
             # Create the user
-            logger.info(f"Creating user in Authentik: {email}")
+            logger.info("Creating user in Authentik: %s", email)
             user_response = await self._make_request("POST", "/core/users/", user_data)
             
             user_pk = user_response.get("pk")
@@ -176,17 +226,17 @@ class AuthentikService:
             if groups:
                 await self._add_user_to_groups(user_pk, groups)
             
-            logger.info(f"Successfully created user in Authentik: {email} (PK: {user_pk})")
+            logger.info("Successfully created user in Authentik: %s (PK: %s)", email, user_pk)
             return user_response
             
         except Exception as e:
-            logger.error(f"Failed to create user in Authentik: {e}")
+            logger.error("Failed to create user in Authentik: %s", e)
             raise AuthentikAPIError(f"User creation failed: {str(e)}")
     
     async def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
         """Get user by email from Authentik"""
         try:
-            params = {"email": email}
+            params = {"email": email, "page_size": 1}
             response = await self._make_request("GET", "/core/users/", params=params)
             
             results = response.get("results", [])
@@ -196,13 +246,13 @@ class AuthentikService:
             return None
             
         except Exception as e:
-            logger.error(f"Failed to get user by email from Authentik: {e}")
+            logger.error("Failed to get user by email from Authentik: %s", e)
             return None
     
     async def get_user_by_username(self, username: str) -> Optional[Dict[str, Any]]:
         """Get user by username from Authentik"""
         try:
-            params = {"username": username}
+            params = {"username": username, "page_size": 1}
             response = await self._make_request("GET", "/core/users/", params=params)
             
             results = response.get("results", [])
@@ -212,55 +262,70 @@ class AuthentikService:
             return None
             
         except Exception as e:
-            logger.error(f"Failed to get user by username from Authentik: {e}")
+            logger.error("Failed to get user by username from Authentik: %s", e)
             return None
     
     async def update_user(self, user_pk: int, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update user in Authentik"""
         try:
-            logger.info(f"Updating user in Authentik: PK {user_pk}")
+            logger.info("Updating user in Authentik: PK %s", user_pk)
             response = await self._make_request("PATCH", f"/core/users/{user_pk}/", updates)
             return response
             
         except Exception as e:
-            logger.error(f"Failed to update user in Authentik: {e}")
+            logger.error("Failed to update user in Authentik: %s", e)
             raise AuthentikAPIError(f"User update failed: {str(e)}")
     
     async def delete_user(self, user_pk: int) -> bool:
         """Delete user from Authentik"""
         try:
-            logger.info(f"Deleting user in Authentik: PK {user_pk}")
+            logger.info("Deleting user in Authentik: PK %s", user_pk)
             await self._make_request("DELETE", f"/core/users/{user_pk}/")
             return True
             
         except Exception as e:
-            logger.error(f"Failed to delete user in Authentik: {e}")
+            logger.error("Failed to delete user in Authentik: %s", e)
             return False
     
     async def get_groups(self) -> List[Dict[str, Any]]:
         """Get all groups from Authentik"""
         try:
-            response = await self._make_request("GET", "/core/groups/")
-            return response.get("results", [])
+            groups = []
+            params = {"page_size": self._DEFAULT_PAGE_SIZE, "page": 1}
+            while True:
+                response = await self._make_request("GET", "/core/groups/", params=params)
+                groups.extend(response.get("results", []))
+                
+                # Authentik reports the next page number, or 0 on the last page
+                next_page = response.get("pagination", {}).get("next")
+                if not next_page:
+                    return groups
+                params["page"] = next_page
             
         except Exception as e:
-            logger.error(f"Failed to get groups from Authentik: {e}")
+            logger.error("Failed to get groups from Authentik: %s", e)
             return []
     
     async def get_group_by_name(self, group_name: str) -> Optional[Dict[str, Any]]:
-        """Get group by name from Authentik"""
+        """Get group by name from Authentik (cached for GROUP_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        cached = self._group_cache.get(group_name)
+        if cached and now - cached[0] < GROUP_CACHE_TTL:
+            return cached[1]
+        
         try:
-            params = {"name": group_name}
+            params = {"name": group_name, "page_size": 1}
             response = await self._make_request("GET", "/core/groups/", params=params)
             
             results = response.get("results", [])
             if results:
+                self._group_cache[group_name] = (now, results[0])
                 return results[0]  # Return first match
             
             return None
             
         except Exception as e:
-            logger.error(f"Failed to get group by name from Authentik: {e}")
+            logger.error("Failed to get group by name from Authentik: %s", e)
             return None
     
     async def create_group(
@@ -287,81 +352,83 @@ class AuthentikService:
             if attributes:
                 group_data["attributes"] = attributes
             
-            logger.info(f"Creating group in Authentik: {name}")
+            logger.info("Creating group in Authentik: %s", name)
             response = await self._make_request("POST", "/core/groups/", group_data)
+            self._group_cache.pop(name, None)
             return response
             
         except Exception as e:
-            logger.error(f"Failed to create group in Authentik: {e}")
+            logger.error("Failed to create group in Authentik: %s", e)
             raise AuthentikAPIError(f"Group creation failed: {str(e)}")
     
+    async def _get_groups_by_name(self, group_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up several groups concurrently, keyed by name (missing groups are omitted)"""
+        groups = await asyncio.gather(*[self.get_group_by_name(name) for name in group_names])
+        found = {}
+        for group_name, group in zip(group_names, groups):
+            if group:
+                found[group_name] = group
+            else:
+                logger.warning("Group '%s' not found in Authentik", group_name)
+        return found
+    
+    async def _update_group_memberships(self, user_pk: int, action: str, group_pks: List[int]):
+        """POST add_user/remove_user for each group concurrently, logging failures"""
+        user_data = {"pk": user_pk}
+        results = await asyncio.gather(
+            *[
+                self._make_request("POST", f"/core/groups/{group_pk}/{action}/", user_data)
+                for group_pk in group_pks
+            ],
+            return_exceptions=True
+        )
+        
+        for group_pk, result in zip(group_pks, results):
+            if isinstance(result, Exception):
+                logger.error("%s failed for user %s on group PK %s: %s", action, user_pk, group_pk, result)
+            else:
+                logger.info("%s succeeded for user %s on group PK %s", action, user_pk, group_pk)
+    
     async def _add_user_to_groups(self, user_pk: int, group_names: List[str]):
         """Add user to specified groups"""
-        for group_name in group_names:
-            try:
-                group = await self.get_group_by_name(group_name)
-                if not group:
-                    logger.warning(f"Group '{group_name}' not found in Authentik")
-                    continue
-                
-                # Add user to group
-                group_pk = group["pk"]
-                user_data = {"pk": user_pk}
-                
-                await self._make_request(
-                    "POST", 
-                    f"/core/groups/{group_pk}/add_user/", 
-                    user_data
-                )
-                
-                logger.info(f"Added user {user_pk} to group '{group_name}'")
-                
-            except Exception as e:
-                logger.error(f"Failed to add user to group '{group_name}': {e}")
+        groups = await self._get_groups_by_name(group_names)
+        await self._update_group_memberships(
+            user_pk, "add_user", [group["pk"] for group in groups.values()]
+        )
     
     async def sync_user_groups(self, user_pk: int, group_names: List[str]):
         """Sync user's groups (remove from old groups, add to new ones)"""
         try:
-            # Get current user data
-            user_response = await self._make_request("GET", f"/core/users/{user_pk}/")
-            current_groups = user_response.get("groups", [])
-            
-            # Get target group PKs
-            target_group_pks = []
-            for group_name in group_names:
-                group = await self.get_group_by_name(group_name)
-                if group:
-                    target_group_pks.append(group["pk"])
-            
-            # Remove user from groups not in target list
-            for group_pk in current_groups:
-                if group_pk not in target_group_pks:
-                    try:
-                        user_data = {"pk": user_pk}
-                        await self._make_request(
-                            "POST", 
-                            f"/core/groups/{group_pk}/remove_user/", 
-                            user_data
-                        )
-                        logger.info(f"Removed user {user_pk} from group PK {group_pk}")
-                    except Exception as e:
-                        logger.error(f"Failed to remove user from group PK {group_pk}: {e}")
+            # Current membership and target groups are independent lookups
+            user_response, target_groups = await asyncio.gather(
+                self._make_request("GET", f"/core/users/{user_pk}/"),
+                self._get_groups_by_name(group_names)
+            )
+            current_groups = set(user_response.get("groups", []))
+            target_group_pks = {group["pk"] for group in target_groups.values()}
             
-            # Add user to new groups
-            await self._add_user_to_groups(user_pk, group_names)
+            # Remove user from groups not in target list and add to the new ones
+            await asyncio.gather(
+                self._update_group_memberships(
+                    user_pk, "remove_user", list(current_groups - target_group_pks)
+                ),
+                self._update_group_memberships(
+                    user_pk, "add_user", list(target_group_pks - current_groups)
+                )
+            )
             
         except Exception as e:
-            logger.error(f"Failed to sync user groups: {e}")
+            logger.error("Failed to sync user groups: %s", e)
     
     async def set_user_password(self, user_pk: int, password: str):
         """Set user password in Authentik"""
         try:
             password_data = {"password": password}
             await self._make_request("POST", f"/core/users/{user_pk}/set_password/", password_data)
-            logger.info(f"Password set for user PK {user_pk}")
+            logger.info("Password set for user PK %s", user_pk)
             
         except Exception as e:
-            logger.error(f"Failed to set password for user: {e}")
+            logger.error("Failed to set password for user: %s", e)
             raise AuthentikAPIError(f"Password setting failed: {str(e)}")
     
     def is_configured(self) -> bool:
@@ -394,7 +461,7 @@ async def create_organization_admin(
         # Check if user already exists
         existing_user = await authentik_service.get_user_by_email(email)
         if existing_user:
-            logger.info(f"User already exists in Authentik: {email}")
+            logger.info("User already exists in Authentik: %s", email)
             return existing_user
         
         # Create user with business admin role
@@ -416,7 +483,7 @@ async def create_organization_admin(
         return user_data
         
     except Exception as e:
-        logger.error(f"Failed to create organization admin in Authentik: {e}")
+        logger.error("Failed to create organization admin in Authentik: %s", e)
         return None
 
 
@@ -432,18 +499,33 @@ async def ensure_default_groups():
         {"name": "sonicus-user", "is_superuser": False}
     ]
     
-    for group_config in default_groups:
-        try:
-            existing_group = await authentik_service.get_group_by_name(group_config["name"])
-            if not existing_group:
-                await authentik_service.create_group(
-                    name=group_config["name"],
-                    is_superuser=group_config["is_superuser"],
-                    attributes={
-                        "description": f"Sonicus {group_config['name'].split('-')[1].replace('_', ' ').title()} users",
-                        "created_by": "sonicus_system"
-                    }
-                )
-                logger.info(f"Created default group: {group_config['name']}")
-        except Exception as e:
-            logger.error(f"Failed to create default group {group_config['name']}: {e}")
+    # Look up every default group at once, then create the missing ones at once
+    existing_groups = await asyncio.gather(
+        *[authentik_service.get_group_by_name(group_config["name"]) for group_config in default_groups]
+    )
+    missing_groups = [
+        group_config
+        for group_config, existing_group in zip(default_groups, existing_groups)
+        if not existing_group
+    ]
+    
+    results = await asyncio.gather(
+        *[
+            authentik_service.create_group(
+                name=group_config["name"],
+                is_superuser=group_config["is_superuser"],
+                attributes={
+                    "description": f"Sonicus {group_config['name'].split('-')[1].replace('_', ' ').title()} users",
+                    "created_by": "sonicus_system"
+                }
+            )
+            for group_config in missing_groups
+        ],
+        return_exceptions=True
+    )
+    
+    for group_config, result in zip(missing_groups, results):
+        if isinstance(result, Exception):
+            logger.error("Failed to create default group %s: %s", group_config['name'], result)
+        else:
+            logger.info("Created default group: %s", group_config['name'])
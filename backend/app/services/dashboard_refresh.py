@@ -6,23 +6,146 @@ supporting both manual refresh and automatic background updates.
 """
 
 import asyncio
+import contextlib
+import functools
+import hashlib
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, Any, Optional, List
+import orjson
 from fastapi import HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
 
-from app.db.session import get_db
+from app.db.session import AsyncSessionLocal
+from app.db.utils import DASHBOARD_SNAPSHOT_VIEW
+from app.core.cache import redis_client
 from app.core.redis_caching import advanced_cache
 from app.models.user import User, UserRole
 from app.models.organization import Organization
 from app.models.subscription import Subscription
+from app.models.invoice import Invoice
 from app.models.therapy_sound import TherapySound
 from app.routers.dashboard_websocket import dashboard_ws_manager
-from sqlalchemy import func, and_
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
 
 logger = logging.getLogger(__name__)
 
+# Held while a dashboard refresh runs, so workers do not refresh at the same time
+REFRESH_LOCK_KEY = "lock:dashboard:refresh"
+REFRESH_LOCK_TTL = 300  # seconds
+
+# Cached dashboard sections, and the same plus the refresh metadata entry
+CACHE_KEYS = ("platform_stats", "revenue_analytics", "growth_trends", "system_health")
+CACHE_KEYS_WITH_META = CACHE_KEYS + ("metadata",)
+
+# How old each cached section may get before a snapshot read triggers a background refresh
+SECTION_MAX_STALENESS = {
+    "system_health": 60,
+    "platform_stats": 300,
+    "revenue_analytics": 300,
+    "growth_trends": 3600
+}  # seconds
+
+# Background refresh schedule; a refresh is cut off at 80% of the interval
+# so the next one starts on time
+BACKGROUND_REFRESH_INTERVAL = 300  # seconds
+BACKGROUND_REFRESH_TIMEOUT = 240  # seconds
+
+# Placeholder figures for metrics without a data source yet, shared by every
+# refresh; nested values stay plain dicts because orjson cannot serialize
+# mappingproxy, so treat them as read-only
+_STATIC_PLATFORM_FIELDS = MappingProxyType({
+    # Growth rates (simplified - would need historical data)
+    "user_growth_rate": 5.2,
+    "org_growth_rate": 8.1,
+    "revenue_growth_rate": 12.3,
+    "active_sessions": 156,  # Would come from session tracking
+    "content_plays": 8432,  # Would come from analytics
+    "conversion_rate": 3.7  # Would be calculated
+})
+
+# Retention and churn data (would come from analytics)
+_STATIC_GROWTH_FIELDS = MappingProxyType({
+    "retention_rate": 85.2,
+    "churn_rate": 2.1,
+    "user_growth_rate": 15.3,
+    "org_growth_rate": 22.1,
+    "geographic_distribution": {
+        "north_america": 45.2,
+        "europe": 28.7,
+        "asia": 18.9,
+        "other": 7.2
+    },
+    "acquisition_channels": {
+        "organic": 42.1,
+        "paid_search": 28.5,
+        "referral": 18.2,
+        "social": 11.2
+    },
+    "key_insights": (
+        "User acquisition increased 23% this month",
+        "Enterprise signups are trending upward",
+        "Mobile usage has grown 45% quarter-over-quarter",
+        "Customer satisfaction scores improved to 4.7/5"
+    )
+})
+
+# System health data (would come from monitoring systems)
+_STATIC_SYSTEM_HEALTH = MappingProxyType({
+    "overall_health_score": 94.7,
+    "status": "healthy",
+    "components": {
+        "database": {
+            "status": "healthy",
+            "response_time": 12,
+            "uptime": 99.8,
+            "connections": 15
+        },
+        "redis_cache": {
+            "status": "healthy",
+            "response_time": 3,
+            "uptime": 99.9,
+            "memory_usage": 45.2
+        },
+        "api_server": {
+            "status": "healthy",
+            "response_time": 89,
+            "uptime": 99.7,
+            "requests_per_minute": 145
+        },
+        "background_jobs": {
+            "status": "healthy",
+            "active_jobs": 3,
+            "queue_size": 8,
+            "success_rate": 98.5
+        }
+    },
+    "performance_metrics": {
+        "avg_response_time": 67,
+        "error_rate": 0.12,
+        "throughput": 145,
+        "cpu_usage": 23.4,
+        "memory_usage": 67.8
+    }
+})
+
+# Threads for the blocking Redis calls of the dashboard cache, kept apart from the
+# default executor; refreshes are single-flight, so few calls are ever in flight
+CACHE_EXECUTOR_WORKERS = 4
+_CACHE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=CACHE_EXECUTOR_WORKERS, thread_name_prefix="dashboard-cache"
+)
+
+
+async def _run_cache_call(func, *args, **kwargs):
+    """Run a blocking Redis call on the dashboard cache executor."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _CACHE_EXECUTOR, functools.partial(func, *args, **kwargs)
+    )
 
 class DashboardDataRefreshService:
     """Service for refreshing and caching dashboard data."""
@@ -30,48 +153,130 @@ class DashboardDataRefreshService:
     def __init__(self):
         self.cache_prefix = "dashboard_cache"
         self.default_ttl = 300  # 5 minutes
-        self.refresh_in_progress = False
+        self._refresh_lock = asyncio.Lock()
+        self._background_refresh: Optional[asyncio.Task] = None
+        # Last payload sent to admin WebSockets and its digest
+        self._last_broadcast_hash: Optional[bytes] = None
+        self._last_broadcast_payload: Optional[Dict[str, Any]] = None
+    
+    @property
+    def refresh_in_progress(self) -> bool:
+        """Whether a refresh is running in this process."""
+        return self._refresh_lock.locked()
         
-    async def refresh_all_dashboard_data(self, db: Session) -> Dict[str, Any]:
+    async def refresh_all_dashboard_data(self, db: AsyncSession) -> Dict[str, Any]:
         """Refresh all dashboard data and update cache."""
-        if self.refresh_in_progress:
+        if self._refresh_lock.locked():
             raise HTTPException(
                 status_code=429, 
                 detail="Dashboard refresh already in progress"
             )
+        
+        async with self._refresh_lock:
+            # Refreshes in other workers; without Redis the lock cannot be taken,
+            # so let the refresh through. The token identifies this holder, so a
+            # refresh outliving the TTL does not release a lock another worker took
+            lock_token = uuid.uuid4().hex
+            acquired = await _run_cache_call(
+                redis_client.set_nx, REFRESH_LOCK_KEY, lock_token, expire=REFRESH_LOCK_TTL
+            )
+            if acquired is False:
+                raise HTTPException(
+                    status_code=429, 
+                    detail="Dashboard refresh already in progress"
+                )
             
-        self.refresh_in_progress = True
+            try:
+                return await self._refresh_all(db)
+            finally:
+                if acquired:
+                    await _run_cache_call(redis_client.delete_if_equals, REFRESH_LOCK_KEY, lock_token)
+    
+    async def get_dashboard_snapshot(self) -> Dict[str, Any]:
+        """
+        Return the cached dashboard sections without waiting for a refresh.
+        
+        When a section is missing or older than its maximum staleness, a refresh is
+        started in the background and the cached data is served in the meantime.
+        """
+        cached = await _run_cache_call(advanced_cache.get_many, "dashboard", list(CACHE_KEYS_WITH_META))
+        
+        # All sections are written together, so the last refresh dates every one of them
+        metadata = cached.get("metadata") or {}
+        staleness_seconds = None
+        if metadata.get("last_refresh"):
+            last_refresh = datetime.fromisoformat(metadata["last_refresh"])
+            staleness_seconds = (datetime.now() - last_refresh).total_seconds()
+        
+        stale_sections = [
+            key for key, max_staleness in SECTION_MAX_STALENESS.items()
+            if cached.get(key) is None or staleness_seconds is None or staleness_seconds > max_staleness
+        ]
+        
+        return {
+            "data": {key: cached.get(key) for key in CACHE_KEYS},
+            "last_refresh": metadata.get("last_refresh"),
+            "staleness_seconds": staleness_seconds,
+            "stale_sections": stale_sections,
+            "refresh_scheduled": bool(stale_sections) and self._schedule_background_refresh()
+        }
+    
+    def _schedule_background_refresh(self) -> bool:
+        """Start a refresh in the background unless one is already running."""
+        if self.refresh_in_progress or (self._background_refresh and not self._background_refresh.done()):
+            return False
+        self._background_refresh = asyncio.create_task(self._refresh_with_own_session())
+        return True
+    
+    async def _refresh_with_own_session(self):
+        """Run a refresh on a session of its own, outliving the request that started it."""
+        async with AsyncSessionLocal() as db:
+            try:
+                await self.refresh_all_dashboard_data(db)
+            except HTTPException:
+                pass  # Another worker is already refreshing
+    
+    async def _refresh_all(self, db: AsyncSession) -> Dict[str, Any]:
+        """Rebuild every dashboard section, cache it and notify connected admins."""
         refresh_results = {}
+        now = datetime.now()
+        now_iso = now.isoformat()
+        cutoff_30d = now - timedelta(days=30)
         
         try:
             logger.info("Starting complete dashboard data refresh")
             
-            # Refresh platform statistics
-            platform_stats = await self._refresh_platform_stats(db)
-            refresh_results["platform_stats"] = platform_stats
-            
-            # Refresh revenue analytics
-            revenue_analytics = await self._refresh_revenue_analytics(db)
-            refresh_results["revenue_analytics"] = revenue_analytics
-            
-            # Refresh growth trends
-            growth_trends = await self._refresh_growth_trends(db)
-            refresh_results["growth_trends"] = growth_trends
-            
-            # Refresh system health
-            system_health = await self._refresh_system_health(db)
-            refresh_results["system_health"] = system_health
-            
-            # Update cache timestamps
-            await self._update_cache_metadata()
+            # One connection for the whole refresh, in autocommit so a failed view read
+            # does not abort the inline fallback and no transaction snapshot is held
+            conn = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+            
+            # Read every aggregate the sections need in a single round-trip
+            snapshot = await self._query_snapshot(conn, cutoff_30d)
+            
+            refresh_results["platform_stats"] = self._refresh_platform_stats(snapshot)
+            refresh_results["revenue_analytics"] = self._refresh_revenue_analytics(snapshot)
+            refresh_results["growth_trends"] = self._refresh_growth_trends(snapshot)
+            refresh_results["system_health"] = self._refresh_system_health()
+            
+            # Cache every section and the refresh metadata in one pipelined write
+            metadata = await self._build_cache_metadata(now_iso)
+            await _run_cache_call(
+                advanced_cache.set_many, "dashboard", {
+                    "platform_stats": (refresh_results["platform_stats"], self.default_ttl),
+                    "revenue_analytics": (refresh_results["revenue_analytics"], self.default_ttl),
+                    "growth_trends": (refresh_results["growth_trends"], self.default_ttl),
+                    "system_health": (refresh_results["system_health"], 60),  # Shorter TTL for health data
+                    "metadata": (metadata, 3600)  # 1 hour TTL
+                }
+            )
             
             # Notify WebSocket connections of refresh
-            await self._notify_websocket_refresh(refresh_results)
+            await self._notify_websocket_refresh(refresh_results, now_iso)
             
             logger.info("Dashboard data refresh completed successfully")
             return {
                 "success": True,
-                "refreshed_at": datetime.now().isoformat(),
+                "refreshed_at": now_iso,
                 "data": refresh_results
             }
             
@@ -80,234 +285,163 @@ class DashboardDataRefreshService:
             return {
                 "success": False,
                 "error": str(e),
-                "refreshed_at": datetime.now().isoformat()
-            }
-        finally:
-            self.refresh_in_progress = False
-            
-    async def _refresh_platform_stats(self, db: Session) -> Dict[str, Any]:
-        """Refresh platform statistics."""
-        try:
-            # Count total users
-            total_users = db.query(User).count()
-            
-            # Count active users (logged in within last 30 days)
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            active_users = db.query(User).filter(
-                User.last_login >= thirty_days_ago
-            ).count()
-            
-            # Count total organizations
-            total_organizations = db.query(Organization).count()
-            
-            # Calculate monthly revenue (simplified)
-            monthly_revenue = db.query(func.sum(Subscription.price)).scalar() or 0.0
-            
-            # Count therapy sounds
-            total_sounds = db.query(TherapySound).count()
-            
-            # Calculate growth rates (simplified - would need historical data)
-            user_growth_rate = 5.2  # Mock growth rate
-            org_growth_rate = 8.1
-            revenue_growth_rate = 12.3
-            
-            platform_stats = {
-                "total_users": total_users,
-                "active_users": active_users,
-                "total_organizations": total_organizations,
-                "monthly_revenue": float(monthly_revenue),
-                "total_sounds": total_sounds,
-                "user_growth_rate": user_growth_rate,
-                "org_growth_rate": org_growth_rate,
-                "revenue_growth_rate": revenue_growth_rate,
-                "active_sessions": 156,  # Mock data - would come from session tracking
-                "content_plays": 8432,  # Mock data - would come from analytics
-                "conversion_rate": 3.7   # Mock data - would be calculated
-            }
-            
-            # Cache the data
-            cache_key = "platform_stats"
-            advanced_cache.set("dashboard", cache_key, platform_stats, ttl=self.default_ttl)
-            
-            return platform_stats
-            
-        except Exception as e:
-            logger.error(f"Failed to refresh platform stats: {e}")
-            raise
-            
-    async def _refresh_revenue_analytics(self, db: Session) -> Dict[str, Any]:
-        """Refresh revenue analytics."""
-        try:
-            # Calculate revenue metrics (simplified)
-            total_revenue = db.query(func.sum(Subscription.price)).scalar() or 0.0
-            total_subscribers = db.query(Subscription).filter(Subscription.is_active == True).count()
-            
-            # Calculate key metrics
-            mrr = float(total_revenue)  # Monthly Recurring Revenue
-            arr = mrr * 12  # Annual Recurring Revenue
-            arpu = mrr / max(total_subscribers, 1)  # Average Revenue Per User
-            clv = arpu * 24  # Customer Lifetime Value (simplified)
-            
-            revenue_analytics = {
-                "mrr": mrr,
-                "arr": arr,
-                "arpu": arpu,
-                "clv": clv,
-                "total_revenue": float(total_revenue),
-                "total_subscribers": total_subscribers,
-                "mrr_growth_rate": 8.5,  # Mock growth rate
-                "arr_growth_rate": 8.5,
-                "churn_rate": 2.1,
-                "revenue_breakdown": {
-                    "starter": mrr * 0.3,
-                    "professional": mrr * 0.5,
-                    "enterprise": mrr * 0.2
-                }
+                "refreshed_at": now_iso
             }
             
-            # Cache the data
-            cache_key = "revenue_analytics"
-            advanced_cache.set("dashboard", cache_key, revenue_analytics, ttl=self.default_ttl)
-            
-            return revenue_analytics
-            
-        except Exception as e:
-            logger.error(f"Failed to refresh revenue analytics: {e}")
-            raise
-            
-    async def _refresh_growth_trends(self, db: Session) -> Dict[str, Any]:
-        """Refresh growth trends."""
+    async def _query_snapshot(self, conn: AsyncConnection, cutoff_30d: datetime) -> Dict[str, Any]:
+        """
+        Read the counts and sums behind every dashboard section.
+        
+        The aggregates are read from the snapshot materialized view, which the
+        refresh_dashboard_snapshot_view job refreshes on its own schedule; when
+        the view is missing or unreadable (e.g. not populated yet) they are
+        computed inline.
+        """
         try:
-            # Calculate growth metrics (simplified)
-            thirty_days_ago = datetime.now() - timedelta(days=30)
-            
-            new_users = db.query(User).filter(User.created_at >= thirty_days_ago).count()
-            new_organizations = db.query(Organization).filter(
-                Organization.created_at >= thirty_days_ago
-            ).count()
-            
-            # Mock retention and churn data (would come from analytics)
-            growth_trends = {
-                "new_users": new_users,
-                "new_organizations": new_organizations,
-                "retention_rate": 85.2,
-                "churn_rate": 2.1,
-                "user_growth_rate": 15.3,
-                "org_growth_rate": 22.1,
-                "geographic_distribution": {
-                    "north_america": 45.2,
-                    "europe": 28.7,
-                    "asia": 18.9,
-                    "other": 7.2
-                },
-                "acquisition_channels": {
-                    "organic": 42.1,
-                    "paid_search": 28.5,
-                    "referral": 18.2,
-                    "social": 11.2
-                },
-                "key_insights": [
-                    "User acquisition increased 23% this month",
-                    "Enterprise signups are trending upward",
-                    "Mobile usage has grown 45% quarter-over-quarter",
-                    "Customer satisfaction scores improved to 4.7/5"
-                ]
-            }
-            
-            # Cache the data
-            cache_key = "growth_trends"
-            advanced_cache.set("dashboard", cache_key, growth_trends, ttl=self.default_ttl)
-            
-            return growth_trends
-            
-        except Exception as e:
-            logger.error(f"Failed to refresh growth trends: {e}")
-            raise
+            result = await conn.execute(text(f"SELECT * FROM {DASHBOARD_SNAPSHOT_VIEW}"))
+            snapshot = dict(result.mappings().one())
+            snapshot.pop("snapshot_id", None)
+            return snapshot
+        except DBAPIError as e:
+            logger.warning(f"Dashboard snapshot view unavailable, computing aggregates inline: {e}")
+            return await self._query_snapshot_inline(conn, cutoff_30d)
+    
+    async def _query_snapshot_inline(self, conn: AsyncConnection, cutoff_30d: datetime) -> Dict[str, Any]:
+        """Read the counts and sums behind every dashboard section in one query."""
+        result = await conn.execute(select(
+            select(func.count()).select_from(User).scalar_subquery().label("total_users"),
+            # Active users logged in within the last 30 days
+            select(func.count()).select_from(User).where(
+                User.last_login >= cutoff_30d
+            ).scalar_subquery().label("active_users"),
+            select(func.count()).select_from(User).where(
+                User.created_at >= cutoff_30d
+            ).scalar_subquery().label("new_users"),
+            select(func.count()).select_from(Organization).scalar_subquery().label("total_organizations"),
+            select(func.count()).select_from(Organization).where(
+                Organization.created_at >= cutoff_30d
+            ).scalar_subquery().label("new_organizations"),
+            # Monthly revenue: paid invoices issued within the last 30 days
+            select(func.coalesce(func.sum(Invoice.amount), 0.0)).where(
+                Invoice.status == "paid",
+                Invoice.issue_date >= cutoff_30d
+            ).scalar_subquery().label("monthly_revenue"),
+            select(func.count()).select_from(Subscription).where(
+                Subscription.status == "active"
+            ).scalar_subquery().label("active_subscriptions"),
+            select(func.count()).select_from(TherapySound).scalar_subquery().label("total_sounds")
+        ))
+        
+        return dict(result.mappings().one())
+    
+    def _refresh_platform_stats(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Build platform statistics from the aggregate snapshot."""
+        return {
+            "total_users": snapshot["total_users"],
+            "active_users": snapshot["active_users"],
+            "total_organizations": snapshot["total_organizations"],
+            "monthly_revenue": float(snapshot["monthly_revenue"]),
+            "total_sounds": snapshot["total_sounds"],
+            **_STATIC_PLATFORM_FIELDS
+        }
             
-    async def _refresh_system_health(self, db: Session) -> Dict[str, Any]:
-        """Refresh system health metrics."""
-        try:
-            # Mock system health data (would come from monitoring systems)
-            system_health = {
-                "overall_health_score": 94.7,
-                "status": "healthy",
-                "components": {
-                    "database": {
-                        "status": "healthy",
-                        "response_time": 12,
-                        "uptime": 99.8,
-                        "connections": 15
-                    },
-                    "redis_cache": {
-                        "status": "healthy", 
-                        "response_time": 3,
-                        "uptime": 99.9,
-                        "memory_usage": 45.2
-                    },
-                    "api_server": {
-                        "status": "healthy",
-                        "response_time": 89,
-                        "uptime": 99.7,
-                        "requests_per_minute": 145
-                    },
-                    "background_jobs": {
-                        "status": "healthy",
-                        "active_jobs": 3,
-                        "queue_size": 8,
-                        "success_rate": 98.5
-                    }
-                },
-                "performance_metrics": {
-                    "avg_response_time": 67,
-                    "error_rate": 0.12,
-                    "throughput": 145,
-                    "cpu_usage": 23.4,
-                    "memory_usage": 67.8
-                }
+    def _refresh_revenue_analytics(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Build revenue analytics from the aggregate snapshot."""
+        # Calculate revenue metrics (simplified)
+        total_revenue = snapshot["monthly_revenue"]
+        total_subscribers = snapshot["active_subscriptions"]
+        
+        # Calculate key metrics
+        mrr = float(total_revenue)  # Monthly Recurring Revenue
+        arr = mrr * 12  # Annual Recurring Revenue
+        arpu = mrr / max(total_subscribers, 1)  # Average Revenue Per User
+        clv = arpu * 24  # Customer Lifetime Value (simplified)
+        
+        return {
+            "mrr": mrr,
+            "arr": arr,
+            "arpu": arpu,
+            "clv": clv,
+            "total_revenue": float(total_revenue),
+            "total_subscribers": total_subscribers,
+            "mrr_growth_rate": 8.5,  # Mock growth rate
+            "arr_growth_rate": 8.5,
+            "churn_rate": 2.1,
+            "revenue_breakdown": {
+                "starter": mrr * 0.3,
+                "professional": mrr * 0.5,
+                "enterprise": mrr * 0.2
             }
+        }
             
-            # Cache the data
-            cache_key = "system_health"
-            advanced_cache.set("dashboard", cache_key, system_health, ttl=60)  # Shorter TTL for health data
-            
-            return system_health
+    def _refresh_growth_trends(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Build growth trends from the aggregate snapshot."""
+        return {
+            "new_users": snapshot["new_users"],
+            "new_organizations": snapshot["new_organizations"],
+            **_STATIC_GROWTH_FIELDS
+        }
             
-        except Exception as e:
-            logger.error(f"Failed to refresh system health: {e}")
-            raise
+    def _refresh_system_health(self) -> Dict[str, Any]:
+        """Build system health metrics."""
+        return dict(_STATIC_SYSTEM_HEALTH)
             
-    async def _update_cache_metadata(self):
-        """Update cache metadata with refresh timestamps."""
-        metadata = {
-            "last_refresh": datetime.now().isoformat(),
+    async def _build_cache_metadata(self, refreshed_at: str) -> Dict[str, Any]:
+        """Build cache metadata with refresh timestamps."""
+        return {
+            "last_refresh": refreshed_at,
             "refresh_count": await self._increment_refresh_count(),
             "cache_status": "healthy"
         }
         
-        cache_key = "metadata"
-        advanced_cache.set("dashboard", cache_key, metadata, ttl=3600)  # 1 hour TTL
-        
     async def _increment_refresh_count(self) -> int:
         """Increment and return refresh count."""
-        cache_key = "refresh_count"
+        # INCR is atomic, so concurrent background and manual refreshes never lose a count
+        refresh_count = await _run_cache_call(
+            redis_client.incr, f"{self.cache_prefix}:refresh_count", expire=86400  # 24 hour TTL
+        )
+        return refresh_count or 1
+            
+    async def _notify_websocket_refresh(self, data: Dict[str, Any], timestamp: str):
+        """
+        Notify WebSocket connections of data refresh.
+        
+        Connected admins get the first refresh in full and later ones as the
+        sections that changed, and nothing at all when the data is identical.
+        The full frame is kept on the manager for admins connecting afterwards,
+        so every client holds the data the next delta is computed against.
+        """
         try:
-            current_count = advanced_cache.get("dashboard", cache_key) or 0
-            new_count = int(current_count) + 1
-            advanced_cache.set("dashboard", cache_key, new_count, ttl=86400)  # 24 hour TTL
-            return new_count
-        except Exception:
-            return 1
+            payload_hash = hashlib.blake2b(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).digest()
+            if payload_hash == self._last_broadcast_hash:
+                logger.debug("Dashboard data unchanged, skipping refresh notification")
+                return
             
-    async def _notify_websocket_refresh(self, data: Dict[str, Any]):
-        """Notify WebSocket connections of data refresh."""
-        try:
-            refresh_message = {
+            full_frame = orjson.dumps({
                 "type": "data_refresh",
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": timestamp,
                 "data": data
-            }
+            })
+            if self._last_broadcast_payload is None:
+                frame = full_frame
+            else:
+                frame = orjson.dumps({
+                    "type": "data_refresh_delta",
+                    "timestamp": timestamp,
+                    "changes": {
+                        key: value for key, value in data.items()
+                        if value != self._last_broadcast_payload.get(key)
+                    }
+                })
             
-            await dashboard_ws_manager.broadcast_to_admins(refresh_message)
+            # Published before the broadcast picks its recipients, so an admin
+            # connecting now gets either this full frame or the broadcast
+            dashboard_ws_manager.latest_refresh_frame = full_frame
+            self._last_broadcast_hash = payload_hash
+            self._last_broadcast_payload = data
+            
+            # Serialized once, however many admins are connected
+            await dashboard_ws_manager.broadcast_raw(frame)
             logger.info("Sent refresh notification to WebSocket connections")
             
         except Exception as e:
@@ -316,19 +450,17 @@ class DashboardDataRefreshService:
     async def get_cache_statistics(self) -> Dict[str, Any]:
         """Get dashboard cache statistics."""
         try:
-            metadata_key = "metadata"
-            metadata = advanced_cache.get("dashboard", metadata_key) or {}
-            
-            cache_keys = ["platform_stats", "revenue_analytics", "growth_trends", "system_health"]
+            cached = await _run_cache_call(advanced_cache.get_many, "dashboard", list(CACHE_KEYS_WITH_META))
+            metadata = cached.get("metadata") or {}
             
             cache_status = {}
-            for key in cache_keys:
-                cached_data = advanced_cache.get("dashboard", key)
+            for key in CACHE_KEYS:
+                cached_data = cached.get(key)
                 cache_status[key] = {
                     "cached": cached_data is not None,
-                    "size": len(str(cached_data)) if cached_data else 0
+                    "size": len(orjson.dumps(cached_data)) if cached_data is not None else 0
                 }
-                
+            
             return {
                 "cache_metadata": metadata,
                 "cache_status": cache_status,
@@ -342,13 +474,10 @@ class DashboardDataRefreshService:
     async def clear_dashboard_cache(self):
         """Clear all dashboard cache data."""
         try:
-            cache_keys = ["platform_stats", "revenue_analytics", "growth_trends", "system_health", "metadata"]
-            
-            for key in cache_keys:
-                advanced_cache.delete("dashboard", key)
+            await _run_cache_call(advanced_cache.unlink_many, "dashboard", list(CACHE_KEYS_WITH_META))
                 
             logger.info("Dashboard cache cleared successfully")
-            return {"success": True, "cleared_keys": len(cache_keys)}
+            return {"success": True, "cleared_keys": len(CACHE_KEYS_WITH_META)}
             
         except Exception as e:
             logger.error(f"Failed to clear dashboard cache: {e}")
@@ -362,27 +491,56 @@ dashboard_refresh_service = DashboardDataRefreshService()
 # Background refresh task
 async def background_dashboard_refresh():
     """Background task for automatic dashboard refresh."""
+    loop = asyncio.get_running_loop()
+    # Deadlines follow the monotonic clock, so slow refreshes do not shift the schedule
+    next_deadline = loop.time()
     while True:
+        next_deadline += BACKGROUND_REFRESH_INTERVAL
+        now = loop.time()
+        if now > next_deadline:
+            logger.warning(f"Background dashboard refresh overran by {now - next_deadline:.1f}s, skipping")
+            next_deadline = now + BACKGROUND_REFRESH_INTERVAL
+            continue
+        await asyncio.sleep(next_deadline - now)
+        
         try:
-            await asyncio.sleep(300)  # Refresh every 5 minutes
-            
-            # Get database session (you may need to adjust this based on your setup)
-            from app.db.session import SessionLocal
-            db = SessionLocal()
-            
-            try:
-                await dashboard_refresh_service.refresh_all_dashboard_data(db)
+            async with AsyncSessionLocal() as db:
+                await asyncio.wait_for(
+                    dashboard_refresh_service.refresh_all_dashboard_data(db),
+                    timeout=BACKGROUND_REFRESH_TIMEOUT
+                )
                 logger.info("Background dashboard refresh completed")
-            finally:
-                db.close()
                 
+        except HTTPException:
+            pass  # Another refresh is already running
+        except asyncio.TimeoutError:
+            logger.error(f"Background dashboard refresh timed out after {BACKGROUND_REFRESH_TIMEOUT}s")
         except Exception as e:
             logger.error(f"Background dashboard refresh failed: {e}")
-            await asyncio.sleep(60)  # Wait 1 minute before retrying
+
+
+# Running background refresh loop; the event loop only keeps weak references to tasks
+_background_refresh_task: Optional[asyncio.Task] = None
 
 
 # Function to start background refresh task
 def start_dashboard_background_refresh():
-    """Start the background dashboard refresh task."""
-    asyncio.create_task(background_dashboard_refresh())
-    logger.info("Dashboard background refresh task started")
+    """Start the background dashboard refresh task (application startup)."""
+    global _background_refresh_task
+    if _background_refresh_task is None or _background_refresh_task.done():
+        _background_refresh_task = asyncio.create_task(
+            background_dashboard_refresh(), name="dashboard-refresh"
+        )
+        logger.info("Dashboard background refresh task started")
+
+
+async def stop_dashboard_background_refresh():
+    """Cancel the background dashboard refresh task and wait for it (application shutdown)."""
+    global _background_refresh_task
+    task, _background_refresh_task = _background_refresh_task, None
+    if task is None:
+        return
+    task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await task
+    logger.info("Dashboard background refresh task stopped")
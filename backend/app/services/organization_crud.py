@@ -7,6 +7,7 @@ This service provides complete CRUD operations for organizations.
 import logging
 import uuid
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Optional, Any, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, asc
@@ -25,6 +26,59 @@ from app.core.cache import redis_client
 
 logger = logging.getLogger(__name__)
 
+# Default feature flags per subscription tier. Built once at import and
+# exposed read-only; callers receive a fresh dict they are free to mutate.
+_TIER_FEATURE_SETS = MappingProxyType({
+    SubscriptionTier.STARTER: MappingProxyType({
+        "analytics": False,
+        "custom_branding": False,
+        "api_access": False,
+        "advanced_reporting": False,
+        "white_labeling": False,
+        "sso_integration": False,
+        "bulk_user_management": False,
+        "custom_sounds": False,
+        "priority_support": False,
+        "webhook_notifications": False
+    }),
+    SubscriptionTier.PROFESSIONAL: MappingProxyType({
+        "analytics": True,
+        "custom_branding": True,
+        "api_access": True,
+        "advanced_reporting": False,
+        "white_labeling": False,
+        "sso_integration": False,
+        "bulk_user_management": True,
+        "custom_sounds": True,
+        "priority_support": False,
+        "webhook_notifications": True
+    }),
+    SubscriptionTier.ENTERPRISE: MappingProxyType({
+        "analytics": True,
+        "custom_branding": True,
+        "api_access": True,
+        "advanced_reporting": True,
+        "white_labeling": True,
+        "sso_integration": True,
+        "bulk_user_management": True,
+        "custom_sounds": True,
+        "priority_support": True,
+        "webhook_notifications": True
+    }),
+    SubscriptionTier.CUSTOM: MappingProxyType({
+        "analytics": True,
+        "custom_branding": True,
+        "api_access": True,
+        "advanced_reporting": True,
+        "white_labeling": True,
+        "sso_integration": True,
+        "bulk_user_management": True,
+        "custom_sounds": True,
+        "priority_support": True,
+        "webhook_notifications": True
+    })
+})
+
 
 class OrganizationCRUDService:
     """Organization CRUD operations service"""
@@ -76,13 +130,17 @@ class OrganizationCRUDService:
             )
             
             self.db.add(org)
-            self.db.commit()
-            self.db.refresh(org)
+            self.db.flush()
             
             # Initialize workflows
             self._initialize_onboarding_workflow(str(org.id))
             self._create_default_sound_packages(str(org.id))
             
+            # Commits the organization together with whatever default packages
+            # survived their savepoint
+            self.db.commit()
+            self.db.refresh(org)
+            
             # Log organization creation
             self._log_organization_event(
                 str(org.id), 
@@ -242,58 +300,7 @@ class OrganizationCRUDService:
     
     def _get_default_features(self, tier: SubscriptionTier) -> Dict[str, bool]:
         """Get default features for a subscription tier"""
-        feature_sets = {
-            SubscriptionTier.STARTER: {
-                "analytics": False,
-                "custom_branding": False,
-                "api_access": False,
-                "advanced_reporting": False,
-                "white_labeling": False,
-                "sso_integration": False,
-                "bulk_user_management": False,
-                "custom_sounds": False,
-                "priority_support": False,
-                "webhook_notifications": False
-            },
-            SubscriptionTier.PROFESSIONAL: {
-                "analytics": True,
-                "custom_branding": True,
-                "api_access": True,
-                "advanced_reporting": False,
-                "white_labeling": False,
-                "sso_integration": False,
-                "bulk_user_management": True,
-                "custom_sounds": True,
-                "priority_support": False,
-                "webhook_notifications": True
-            },
-            SubscriptionTier.ENTERPRISE: {
-                "analytics": True,
-                "custom_branding": True,
-                "api_access": True,
-                "advanced_reporting": True,
-                "white_labeling": True,
-                "sso_integration": True,
-                "bulk_user_management": True,
-                "custom_sounds": True,
-                "priority_support": True,
-                "webhook_notifications": True
-            },
-            SubscriptionTier.CUSTOM: {
-                "analytics": True,
-                "custom_branding": True,
-                "api_access": True,
-                "advanced_reporting": True,
-                "white_labeling": True,
-                "sso_integration": True,
-                "bulk_user_management": True,
-                "custom_sounds": True,
-                "priority_support": True,
-                "webhook_notifications": True
-            }
-        }
-        
-        return feature_sets.get(tier, feature_sets[SubscriptionTier.STARTER])
+        return dict(_TIER_FEATURE_SETS.get(tier, _TIER_FEATURE_SETS[SubscriptionTier.STARTER]))
     
     def _initialize_onboarding_workflow(self, org_id: str) -> None:
         """Initialize onboarding workflow for new organization"""
@@ -301,27 +308,27 @@ class OrganizationCRUDService:
         pass
     
     def _create_default_sound_packages(self, org_id: str) -> None:
-        """Create default sound packages for new organization"""
+        """Stage default sound packages for new organization (committed by caller)"""
+        default_packages = [
+            {
+                "package_name": "Welcome Package",
+                "description": "A curated selection of calming sounds to get started",
+                "category": "wellness",
+                "sound_ids": [],  # TODO: Add default sound IDs
+                "auto_assign_new_users": True
+            }
+        ]
+        
+        # Inserted in a savepoint, so a failure drops only the packages and
+        # the organization is still created
         try:
-            default_packages = [
-                {
-                    "package_name": "Welcome Package",
-                    "description": "A curated selection of calming sounds to get started",
-                    "category": "wellness",
-                    "sound_ids": [],  # TODO: Add default sound IDs
-                    "auto_assign_new_users": True
-                }
-            ]
-            
-            for package_data in default_packages:
-                package = OrganizationSoundPackage(
-                    id=uuid.uuid4(),
-                    organization_id=org_id,
-                    **package_data
-                )
-                self.db.add(package)
-            
-            self.db.commit()
+            with self.db.begin_nested():
+                for package_data in default_packages:
+                    self.db.add(OrganizationSoundPackage(
+                        id=uuid.uuid4(),
+                        organization_id=org_id,
+                        **package_data
+                    ))
             
         except Exception as e:
             logger.error(f"Failed to create default sound packages for {org_id}: {e}")
@@ -5,15 +5,15 @@ Production analytics service using actual database data with proper SQLAlchemy h
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, text, desc, case
+from sqlalchemy import func, text, desc, case
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime, date, timedelta
 import logging
 import uuid
 from collections import defaultdict
 import statistics
-import json
 
+from app.core.cache import redis_client
 from app.models.organization import Organization, OrganizationStatus, SubscriptionTier
 from app.models.user import User, UserRole
 from app.models.therapy_sound import TherapySound
@@ -36,6 +36,10 @@ from app.schemas.organization_analytics import (
 
 logger = logging.getLogger(__name__)
 
+# Redis hash of analytics cache hit/miss/write counters, drained by the
+# periodic analytics health check
+CACHE_STATS_KEY = "analytics:cache_stats"
+
 
 class RealDataOrganizationAnalyticsService:
     """Service class for real-data organization analytics operations."""
@@ -99,13 +103,18 @@ class RealDataOrganizationAnalyticsService:
                 # Update hit count properly
                 self.db.query(OrganizationAnalyticsCache).filter(
                     OrganizationAnalyticsCache.id == cache_entry.id
-                ).update({"cache_hit_count": OrganizationAnalyticsCache.cache_hit_count + 1})
+                ).update(
+                    {"cache_hit_count": OrganizationAnalyticsCache.cache_hit_count + 1},
+                    synchronize_session=False
+                )
                 self.db.commit()
+                redis_client.hincrby_many(CACHE_STATS_KEY, {"hits": 1})
                 logger.info(f"Cache hit for {metric_type} metrics for organization {organization_id}")
                 
                 # Return the actual metric data value
                 return self._safe_get_value(cache_entry, 'metric_data', {})
             
+            redis_client.hincrby_many(CACHE_STATS_KEY, {"misses": 1})
             return None
             
         except Exception as e:
@@ -157,6 +166,7 @@ class RealDataOrganizationAnalyticsService:
             
             self.db.add(cache_entry)
             self.db.commit()
+            redis_client.hincrby_many(CACHE_STATS_KEY, {"writes": 1})
             logger.info(f"Cached {metric_type} metrics for organization {organization_id}")
             
         except Exception as e:
@@ -204,6 +214,21 @@ class RealDataOrganizationAnalyticsService:
         end_date: Optional[date] = None
     ) -> RealTimeUsageMetrics:
         """Get real-time usage metrics from actual user session data."""
+        return self.compute_real_time_usage_metrics(organization_id, time_range, start_date, end_date)
+    
+    def compute_real_time_usage_metrics(
+        self, 
+        organization_id: str,
+        time_range: MetricTimeRange = MetricTimeRange.LAST_30_DAYS,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> RealTimeUsageMetrics:
+        """
+        Compute real-time usage metrics from actual user session data.
+        
+        Blocking: the queries run on the service's session, so callers off the
+        event loop (worker threads, Celery tasks) can use this directly.
+        """
         start_time = datetime.utcnow()
         
         try:
@@ -264,6 +289,13 @@ class RealDataOrganizationAnalyticsService:
                     generated_at=datetime.utcnow()
                 )
                 
+                # Cache empty periods too, so idle organizations are not recomputed on every read
+                calculation_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+                self._cache_metrics(
+                    organization_id, "usage", time_range, start_dt, end_dt,
+                    result.model_dump(mode="json"), calculation_time
+                )
+                
                 return result
             
             # Calculate total listening time and average session duration
@@ -405,7 +437,7 @@ class RealDataOrganizationAnalyticsService:
             calculation_time = int((datetime.utcnow() - start_time).total_seconds() * 1000)
             self._cache_metrics(
                 organization_id, "usage", time_range, start_dt, end_dt,
-                result.dict(), calculation_time
+                result.model_dump(mode="json"), calculation_time
             )
             
             return result
@@ -429,7 +461,7 @@ class RealDataOrganizationAnalyticsService:
             query.update({
                 "is_stale": True,
                 "invalidated_at": datetime.utcnow()
-            })
+            }, synchronize_session=False)
             
             self.db.commit()
             logger.info(f"Invalidated cache for organization {organization_id}, types: {metric_types}")
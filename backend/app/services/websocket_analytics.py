@@ -147,6 +147,11 @@ class RealTimeAnalyticsBroadcaster:
     
     async def broadcast_usage_update(self, organization_id: str):
         """Broadcast updated usage metrics to organization connections."""
+        # Nobody to send to (always the case outside the web process, e.g. in
+        # Celery workers): skip recomputing the metrics
+        if not connection_manager.get_organization_connection_count(organization_id):
+            return
+        
         try:
             # Get latest usage metrics
             usage_metrics = await self.analytics_service.get_real_time_usage_metrics(
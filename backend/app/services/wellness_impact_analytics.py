@@ -12,9 +12,8 @@ Author: Sonicus Platform Team
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc, text
+from sqlalchemy import func, desc, asc, text
 import logging
-import json
 import statistics
 from enum import Enum
 
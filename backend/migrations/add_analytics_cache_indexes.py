@@ -0,0 +1,23 @@
+"""
+Add analytics cache lookup index
+
+Revision ID: add_analytics_cache_indexes
+"""
+
+from alembic import op
+
+
+def upgrade():
+    """Create analytics cache indexes"""
+    # Composite index for the (organization, metric type, time range) cache lookup
+    op.create_index(
+        'idx_analytics_cache_lookup',
+        'organization_analytics_cache',
+        ['organization_id', 'metric_type', 'time_range'],
+        schema='sonicus'
+    )
+
+
+def downgrade():
+    """Drop analytics cache indexes"""
+    op.drop_index('idx_analytics_cache_lookup', table_name='organization_analytics_cache', schema='sonicus')
@@ -0,0 +1,53 @@
+"""
+Add analytics cleanup indexes
+
+Revision ID: add_analytics_cleanup_indexes
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    """Create indexes for cache expiry and job log cleanup"""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_analytics_cache_expires_at',
+            'organization_analytics_cache',
+            ['expires_at'],
+            schema='sonicus',
+            postgresql_concurrently=True
+        )
+        # Partial index: only entries that have been read count towards hit statistics
+        op.create_index(
+            'idx_analytics_cache_with_hits',
+            'organization_analytics_cache',
+            ['cache_hit_count'],
+            schema='sonicus',
+            postgresql_where=sa.text('cache_hit_count > 0'),
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_analytics_job_log_created_at',
+            'analytics_job_log',
+            ['created_at'],
+            schema='sonicus',
+            postgresql_concurrently=True
+        )
+        # Partial index: failed jobs are a small fraction of the log
+        op.create_index(
+            'idx_analytics_job_log_failed',
+            'analytics_job_log',
+            ['created_at'],
+            schema='sonicus',
+            postgresql_where=sa.text("status = 'failed'"),
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    """Drop analytics cleanup indexes"""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_analytics_job_log_failed', table_name='analytics_job_log', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_analytics_job_log_created_at', table_name='analytics_job_log', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_analytics_cache_with_hits', table_name='organization_analytics_cache', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_analytics_cache_expires_at', table_name='organization_analytics_cache', schema='sonicus', postgresql_concurrently=True)
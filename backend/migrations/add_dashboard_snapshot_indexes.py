@@ -0,0 +1,62 @@
+"""
+Add dashboard snapshot indexes
+
+Revision ID: add_dashboard_snapshot_indexes
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    """Create indexes behind the admin dashboard snapshot filters"""
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_users_last_login',
+            'users',
+            ['last_login'],
+            schema='sonicus',
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_users_created_at',
+            'users',
+            ['created_at'],
+            schema='sonicus',
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_organizations_created_at',
+            'organizations',
+            ['created_at'],
+            schema='sonicus',
+            postgresql_concurrently=True
+        )
+        # Partial index: only active subscriptions are counted
+        op.create_index(
+            'idx_subscriptions_active',
+            'subscriptions',
+            ['status'],
+            schema='sonicus',
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True
+        )
+        # Partial index: monthly revenue sums paid invoices; amount is included
+        # so the sum can be answered from the index alone
+        op.create_index(
+            'idx_invoices_paid_issue_date',
+            'invoices',
+            ['issue_date', 'amount'],
+            schema='sonicus',
+            postgresql_where=sa.text("status = 'paid'"),
+            postgresql_concurrently=True
+        )
+
+def downgrade():
+    """Drop dashboard snapshot indexes"""
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_invoices_paid_issue_date', table_name='invoices', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_subscriptions_active', table_name='subscriptions', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_organizations_created_at', table_name='organizations', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_users_created_at', table_name='users', schema='sonicus', postgresql_concurrently=True)
+        op.drop_index('idx_users_last_login', table_name='users', schema='sonicus', postgresql_concurrently=True)
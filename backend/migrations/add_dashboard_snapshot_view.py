@@ -0,0 +1,43 @@
+"""
+Add dashboard snapshot materialized view
+
+Revision ID: add_dashboard_snapshot_view
+"""
+
+from alembic import op
+
+def upgrade():
+    """Create the dashboard snapshot materialized view"""
+    # One row holding every aggregate the admin dashboard sections need;
+    # naive timestamp columns are compared against LOCALTIMESTAMP
+    op.execute("""
+        CREATE MATERIALIZED VIEW sonicus.mv_dashboard_snapshot AS
+        SELECT
+            1 AS snapshot_id,
+            (SELECT count(*) FROM sonicus.users) AS total_users,
+            (SELECT count(*) FROM sonicus.users
+             WHERE last_login >= LOCALTIMESTAMP - interval '30 days') AS active_users,
+            (SELECT count(*) FROM sonicus.users
+             WHERE created_at >= LOCALTIMESTAMP - interval '30 days') AS new_users,
+            (SELECT count(*) FROM sonicus.organizations) AS total_organizations,
+            (SELECT count(*) FROM sonicus.organizations
+             WHERE created_at >= now() - interval '30 days') AS new_organizations,
+            (SELECT coalesce(sum(amount), 0.0) FROM sonicus.invoices
+             WHERE status = 'paid'
+               AND issue_date >= LOCALTIMESTAMP - interval '30 days') AS monthly_revenue,
+            (SELECT count(*) FROM sonicus.subscriptions
+             WHERE status = 'active') AS active_subscriptions,
+            (SELECT count(*) FROM sonicus.therapy_sounds) AS total_sounds
+    """)
+    # REFRESH ... CONCURRENTLY requires a unique index
+    op.create_index(
+        'idx_mv_dashboard_snapshot_id',
+        'mv_dashboard_snapshot',
+        ['snapshot_id'],
+        unique=True,
+        schema='sonicus'
+    )
+
+def downgrade():
+    """Drop the dashboard snapshot materialized view"""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS sonicus.mv_dashboard_snapshot")
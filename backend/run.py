@@ -21,6 +21,7 @@ from app.routers import customers  # Customer management and B2C registration
 import logging
 from fastapi import FastAPI, Request, Response, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.core.api_docs import custom_openapi
@@ -56,6 +57,13 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     # Startup logic
     logger.info("Starting up Sonicus application")
+    from app.services.analytics_job_log import job_log_writer
+    job_log_writer.start()
+    from app.services.dashboard_refresh import (
+        start_dashboard_background_refresh,
+        stop_dashboard_background_refresh,
+    )
+    start_dashboard_background_refresh()
     
     # Initialize database and tables
     try:
@@ -174,6 +182,12 @@ async def lifespan(app: FastAPI):
     # Shutdown logic
     logger.info("Shutting down Sonicus application")
     # Close any connections or resources here
+    from app.services.authentik_service import authentik_service
+    await authentik_service.aclose()
+    await job_log_writer.stop()
+    await stop_dashboard_background_refresh()
+    from app.db.session import async_engine
+    await async_engine.dispose()
 
 # Authentik OIDC token validation dependency
 async def authentik_auth(request: Request):
@@ -229,6 +243,8 @@ def create_application() -> FastAPI:
         openapi_url=final_openapi_url,  # Use the processed URL
         lifespan=lifespan,
         debug=settings.DEBUG,
+        # Serialize responses with orjson instead of the stdlib json encoder
+        default_response_class=ORJSONResponse,
         # Make Swagger UI available at BOTH /docs and /api/v1/docs
         docs_url="/docs",  # Root path for convenience
         redoc_url="/redoc",  # Root path for convenience
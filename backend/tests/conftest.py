@@ -17,6 +17,13 @@ from app.models.therapy_sound import TherapySound
 from app.core.security import create_access_token
 from run import app
 
+# The B2C models (app.models.user_b2c, loaded with the API app) declare the same
+# session tables as the organization-scoped models the analytics services use;
+# unregister them so the analytics modules can be imported by the tests
+for _table_name in ("user_sessions", "content_plays", "user_engagement_metrics"):
+    if _table_name in Base.metadata.tables:
+        Base.metadata.remove(Base.metadata.tables[_table_name])
+
 # Define pwd_context for testing if it's not importable from security module
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -0,0 +1,121 @@
+"""
+Tests for the Celery analytics job helpers.
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.organization import Organization, OrganizationStatus
+from app.services import analytics_jobs
+from app.services.analytics_jobs import (
+    ACTIVE_ORG_IDS_CACHE_KEY, ACTIVE_ORG_IDS_CACHE_TTL, iter_active_organization_ids
+)
+from app.services import analytics_refresh
+from app.services.analytics_refresh import AnalyticsRefreshService, CACHE_STATISTICS_KEY
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with three active, two trial and one cancelled organization."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine, tables=[Organization.__table__])
+    session = sessionmaker(bind=engine)()
+    statuses = [OrganizationStatus.ACTIVE] * 3 + [OrganizationStatus.TRIAL] * 2 + [OrganizationStatus.CANCELLED]
+    session.add_all([
+        Organization(
+            name=f"Org {i}",
+            primary_contact_email=f"ops@org{i}.test",
+            subscription_status=status.value
+        )
+        for i, status in enumerate(statuses)
+    ])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=[Organization.__table__])
+        engine.dispose()
+
+
+def test_reads_ids_from_the_database_and_caches_the_full_list(db):
+    with patch.object(analytics_jobs, "redis_client") as redis:
+        redis.get_json.return_value = None
+
+        batches = list(iter_active_organization_ids(db, batch_size=2))
+
+    org_ids = [org_id for batch in batches for org_id in batch]
+    assert len(org_ids) == 5
+    assert all(len(batch) <= 2 for batch in batches)
+    redis.set_json.assert_called_once_with(
+        ACTIVE_ORG_IDS_CACHE_KEY, org_ids, expire=ACTIVE_ORG_IDS_CACHE_TTL
+    )
+
+
+def test_partially_read_ids_are_not_cached(db):
+    with patch.object(analytics_jobs, "redis_client") as redis:
+        redis.get_json.return_value = None
+
+        batches = iter_active_organization_ids(db, batch_size=2)
+        next(batches)
+        batches.close()
+
+    redis.set_json.assert_not_called()
+
+
+def test_cached_ids_are_served_without_querying():
+    db = Mock()
+    with patch.object(analytics_jobs, "redis_client") as redis:
+        redis.get_json.return_value = ["a", "b", "c", "d", "e"]
+
+        batches = list(iter_active_organization_ids(db, batch_size=2))
+
+    assert batches == [["a", "b"], ["c", "d"], ["e"]]
+    redis.get_json.assert_called_once_with(ACTIVE_ORG_IDS_CACHE_KEY)
+    redis.set_json.assert_not_called()
+    db.execute.assert_not_called()
+
+
+def run_cleanups():
+    """Run the Celery and service cleanup paths, returning each expired-cache criterion."""
+    criteria = []
+
+    def delete_in_batches(db, model, criterion):
+        if model is analytics_jobs.OrganizationAnalyticsCache:
+            criteria.append(criterion)
+        return 0
+
+    with patch.object(analytics_jobs, "get_db_session", return_value=Mock()), \
+            patch.object(analytics_jobs, "delete_in_batches", delete_in_batches), \
+            patch.object(analytics_jobs, "redis_client") as jobs_redis, \
+            patch.object(analytics_refresh, "delete_in_batches", delete_in_batches), \
+            patch.object(analytics_refresh, "redis_client") as service_redis:
+        analytics_jobs.cleanup_expired_cache()
+        service = AnalyticsRefreshService()
+        service.db_session = Mock
+        service.cleanup_expired_cache()
+
+    return criteria, jobs_redis, service_redis
+
+
+def test_cleanup_task_drops_cached_statistics():
+    _, jobs_redis, service_redis = run_cleanups()
+
+    jobs_redis.delete.assert_called_once_with(CACHE_STATISTICS_KEY)
+    service_redis.delete.assert_called_once_with(CACHE_STATISTICS_KEY)
+
+
+def test_cleanup_paths_expire_entries_by_the_same_clock():
+    (task_criterion, service_criterion), _, _ = run_cleanups()
+
+    assert str(task_criterion) == str(service_criterion)
+    assert "timezone" in str(task_criterion)
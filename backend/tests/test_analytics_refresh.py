@@ -0,0 +1,202 @@
+"""
+Tests for the in-process analytics refresh service.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy import types as sqltypes
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.db.base import Base
+from app.models.organization import Organization, OrganizationStatus
+from app.models.user import User
+from app.models.therapy_sound import TherapySound
+from app.models.user_session import UserSession, ContentPlay
+from app.models.analytics_cache import OrganizationAnalyticsCache, AnalyticsJobLog
+from app.services.analytics_refresh import AnalyticsRefreshService
+
+
+class StringUuid(sqltypes.Uuid):
+    """UUID type accepting string ids on SQLite, as the PostgreSQL driver does."""
+
+    def bind_processor(self, dialect):
+        process = super().bind_processor(dialect)
+
+        def coerce(value):
+            if isinstance(value, str):
+                value = uuid.UUID(value)
+            return process(value) if process else value
+        return coerce
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite database with the tables the usage refresh touches."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    engine.dialect.colspecs = {**engine.dialect.colspecs, sqltypes.Uuid: StringUuid}
+    tables = [
+        model.__table__ for model in (
+            Organization, User, TherapySound, UserSession, ContentPlay,
+            OrganizationAnalyticsCache, AnalyticsJobLog
+        )
+    ]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    try:
+        yield sessionmaker(bind=engine)
+    finally:
+        Base.metadata.drop_all(bind=engine, tables=tables)
+        engine.dispose()
+
+
+@pytest.fixture
+def refresh_service(session_factory):
+    service = AnalyticsRefreshService()
+    service.db_session = session_factory
+    return service
+
+
+def add_organization(db, name, status):
+    org = Organization(
+        name=name,
+        primary_contact_email=f"ops@{name.lower()}.test",
+        subscription_status=status
+    )
+    db.add(org)
+    db.commit()
+    return org
+
+
+def test_refresh_all_caches_usage_metrics_per_organization(session_factory, refresh_service, monkeypatch):
+    # The in-memory database is a single connection; refresh one organization at a time
+    monkeypatch.setattr(settings, "ANALYTICS_REFRESH_CONCURRENCY", 1)
+    db = session_factory()
+    active = add_organization(db, "Active", OrganizationStatus.ACTIVE.value)
+    trial = add_organization(db, "Trial", OrganizationStatus.TRIAL.value)
+    add_organization(db, "Cancelled", OrganizationStatus.CANCELLED.value)
+
+    user = User(email="listener@active.test", organization_id=active.id)
+    db.add(user)
+    db.commit()
+    db.add(UserSession(
+        user_id=user.id,
+        organization_id=active.id,
+        session_start=datetime.utcnow() - timedelta(days=1),
+        total_listening_time=12.5
+    ))
+    db.commit()
+
+    summary = asyncio.run(refresh_service.refresh_all_organizations_usage_metrics())
+
+    assert summary["total_organizations"] == 2
+    assert summary["error_count"] == 0
+
+    cached = {
+        (str(row.organization_id), row.time_range): row
+        for row in db.query(OrganizationAnalyticsCache).filter(
+            OrganizationAnalyticsCache.metric_type == "usage"
+        )
+    }
+    expected_ranges = {"7d", "30d", "90d"}
+    assert {key[1] for key in cached if key[0] == str(active.id)} == expected_ranges
+    assert {key[1] for key in cached if key[0] == str(trial.id)} == expected_ranges
+    assert len(cached) == 6
+
+    active_30d = cached[(str(active.id), "30d")].metric_data
+    assert active_30d["usage_metrics"]["total_sessions"] == 1
+    assert active_30d["usage_metrics"]["total_minutes_listened"] == 12.5
+
+    job_types = {entry.job_type for entry in db.query(AnalyticsJobLog)}
+    assert job_types == {"refresh_all_usage_metrics", "refresh_usage_metrics"}
+    db.close()
+
+
+def test_concurrent_refreshes_of_an_organization_share_one_run():
+    service = AnalyticsRefreshService()
+    calls = []
+
+    async def slow_refresh(organization_id, time_ranges):
+        calls.append(organization_id)
+        await asyncio.sleep(0.05)
+        return {"organization_id": organization_id, "status": "success"}
+
+    service._refresh_organization_usage_metrics = slow_refresh
+
+    async def exercise():
+        return await asyncio.gather(
+            service.refresh_organization_usage_metrics("org-1"),
+            service.refresh_organization_usage_metrics("org-1"),
+            service.refresh_organization_usage_metrics("org-2"),
+        )
+
+    first, second, other = asyncio.run(exercise())
+
+    assert first is second
+    assert other["organization_id"] == "org-2"
+    assert sorted(calls) == ["org-1", "org-2"]
+    assert service._inflight_refreshes == {}
+
+
+def test_cancelled_caller_does_not_cancel_the_shared_refresh():
+    service = AnalyticsRefreshService()
+    release = None
+
+    async def slow_refresh(organization_id, time_ranges):
+        await release.wait()
+        return {"organization_id": organization_id, "status": "success"}
+
+    service._refresh_organization_usage_metrics = slow_refresh
+
+    async def exercise():
+        nonlocal release
+        release = asyncio.Event()
+        cancelled = asyncio.create_task(service.refresh_organization_usage_metrics("org-1"))
+        waiting = asyncio.create_task(service.refresh_organization_usage_metrics("org-1"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return await waiting
+
+    assert asyncio.run(exercise())["status"] == "success"
+
+
+def test_refresh_all_overlaps_organizations_up_to_the_limit(session_factory, refresh_service, monkeypatch):
+    db = session_factory()
+    org_ids = [str(add_organization(db, f"Org{i}", OrganizationStatus.ACTIVE.value).id) for i in range(5)]
+    db.close()
+    monkeypatch.setattr(settings, "ANALYTICS_REFRESH_CONCURRENCY", 2)
+    running = 0
+    peak = 0
+
+    async def slow_refresh(organization_id, time_ranges):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        if organization_id == org_ids[0]:
+            raise RuntimeError("boom")
+        return {"organization_id": organization_id, "results": {}}
+
+    refresh_service._refresh_organization_usage_metrics = slow_refresh
+
+    summary = asyncio.run(refresh_service.refresh_all_organizations_usage_metrics())
+
+    assert peak == 2
+    assert summary["total_organizations"] == 5
+    assert summary["success_count"] == 4
+    assert summary["error_count"] == 1
+    failed = [result for result in summary["results"] if result.get("status") == "error"]
+    assert failed == [{"organization_id": org_ids[0], "status": "error", "error": "boom"}]
@@ -0,0 +1,241 @@
+"""
+Tests for the Super Admin dashboard refresh service.
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock, patch
+
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.auth_dependencies import get_current_user_compatible
+from app.models.user import UserRole
+from app.routers import dashboard_management
+from app.routers.dashboard_websocket import DashboardWebSocketManager
+from app.services import dashboard_refresh
+from app.services.dashboard_refresh import DashboardDataRefreshService, REFRESH_LOCK_KEY
+
+
+@pytest.fixture
+def service():
+    return DashboardDataRefreshService()
+
+
+@pytest.fixture
+def snapshot_client(service):
+    """Client for the dashboard management router, signed in as a super admin."""
+    app = FastAPI()
+    app.include_router(dashboard_management.router)
+    app.dependency_overrides[dashboard_management.require_super_admin] = lambda: Mock(role=UserRole.SUPER_ADMIN)
+    with patch.object(dashboard_management, "dashboard_refresh_service", service):
+        yield TestClient(app)
+
+
+def cached_sections(refreshed_seconds_ago):
+    """Cached dashboard entries as returned by advanced_cache.get_many."""
+    last_refresh = (datetime.now() - timedelta(seconds=refreshed_seconds_ago)).isoformat()
+    return {
+        "platform_stats": {"total_users": 10},
+        "revenue_analytics": {"mrr": 100.0},
+        "growth_trends": {"new_users": 2},
+        "system_health": {"status": "healthy"},
+        "metadata": {"last_refresh": last_refresh, "refresh_count": 7}
+    }
+
+
+def test_refresh_lock_is_released_with_its_own_token(service):
+    with patch.object(dashboard_refresh, "redis_client") as redis:
+        redis.set_nx.return_value = True
+        service._refresh_all = AsyncMock(return_value={"success": True})
+
+        asyncio.run(service.refresh_all_dashboard_data(Mock()))
+
+    token = redis.set_nx.call_args.args[1]
+    assert redis.set_nx.call_args.args[0] == REFRESH_LOCK_KEY
+    assert token and token != "1"
+    redis.delete_if_equals.assert_called_once_with(REFRESH_LOCK_KEY, token)
+    redis.delete.assert_not_called()
+
+
+def test_refresh_lock_tokens_are_unique(service):
+    with patch.object(dashboard_refresh, "redis_client") as redis:
+        redis.set_nx.return_value = True
+        service._refresh_all = AsyncMock(return_value={"success": True})
+
+        asyncio.run(service.refresh_all_dashboard_data(Mock()))
+        asyncio.run(service.refresh_all_dashboard_data(Mock()))
+
+    first, second = (call.args[1] for call in redis.set_nx.call_args_list)
+    assert first != second
+
+
+def test_refresh_rejected_while_another_worker_holds_the_lock(service):
+    with patch.object(dashboard_refresh, "redis_client") as redis:
+        redis.set_nx.return_value = False
+        service._refresh_all = AsyncMock()
+
+        with pytest.raises(dashboard_refresh.HTTPException) as excinfo:
+            asyncio.run(service.refresh_all_dashboard_data(Mock()))
+
+    assert excinfo.value.status_code == 429
+    service._refresh_all.assert_not_called()
+    redis.delete_if_equals.assert_not_called()
+
+
+def test_redis_calls_run_on_the_cache_executor(service):
+    threads = []
+
+    def record(result):
+        def call(*args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return result
+        return call
+
+    with patch.object(dashboard_refresh, "redis_client") as redis, \
+            patch.object(dashboard_refresh, "advanced_cache") as cache:
+        redis.set_nx.side_effect = record(True)
+        redis.delete_if_equals.side_effect = record(True)
+        redis.incr.side_effect = record(3)
+        cache.get_many.side_effect = record({})
+        cache.unlink_many.side_effect = record(5)
+
+        async def exercise():
+            service._refresh_all = AsyncMock(return_value={"success": True})
+            await service.refresh_all_dashboard_data(Mock())
+            assert await service._increment_refresh_count() == 3
+            await service.get_cache_statistics()
+            await service.clear_dashboard_cache()
+
+        asyncio.run(exercise())
+
+    assert len(threads) == 5
+    assert all(name.startswith("dashboard-cache") for name in threads)
+
+
+def test_admin_connecting_after_a_refresh_gets_the_full_frame(service):
+    manager = DashboardWebSocketManager()
+    manager._background_update_loop = AsyncMock()
+    first = {"platform_stats": {"total_users": 1}, "system_health": {"status": "healthy"}}
+    second = {"platform_stats": {"total_users": 2}, "system_health": {"status": "healthy"}}
+
+    async def exercise():
+        with patch.object(dashboard_refresh, "dashboard_ws_manager", manager):
+            # Nobody is connected yet, the refresh is only published
+            await service._notify_websocket_refresh(first, "t1")
+            websocket = AsyncMock()
+            await manager.connect(websocket, "1", UserRole.SUPER_ADMIN)
+            await service._notify_websocket_refresh(second, "t2")
+        return [orjson.loads(call.args[0]) for call in websocket.send_text.call_args_list]
+
+    received = asyncio.run(exercise())
+
+    assert received[0] == {"type": "data_refresh", "timestamp": "t1", "data": first}
+    assert received[1] == {
+        "type": "data_refresh_delta",
+        "timestamp": "t2",
+        "changes": {"platform_stats": {"total_users": 2}}
+    }
+    assert orjson.loads(manager.latest_refresh_frame)["data"] == second
+
+
+def test_snapshot_serves_fresh_cache_without_refreshing(service, snapshot_client):
+    service._schedule_background_refresh = Mock(return_value=True)
+    with patch.object(dashboard_refresh, "advanced_cache") as cache:
+        cache.get_many.return_value = cached_sections(refreshed_seconds_ago=5)
+
+        response = snapshot_client.get("/super-admin/dashboard/manage/snapshot")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["data"]["platform_stats"] == {"total_users": 10}
+    assert body["stale_sections"] == []
+    assert body["refresh_scheduled"] is False
+    assert body["staleness_seconds"] < 60
+    service._schedule_background_refresh.assert_not_called()
+
+
+def test_snapshot_schedules_refresh_for_stale_sections(service, snapshot_client):
+    service._schedule_background_refresh = Mock(return_value=True)
+    with patch.object(dashboard_refresh, "advanced_cache") as cache:
+        cache.get_many.return_value = cached_sections(refreshed_seconds_ago=120)
+
+        response = snapshot_client.get("/super-admin/dashboard/manage/snapshot")
+
+    body = response.json()
+    # Only system health tolerates less than two minutes of staleness
+    assert body["stale_sections"] == ["system_health"]
+    assert body["refresh_scheduled"] is True
+    assert body["data"]["system_health"] == {"status": "healthy"}
+    service._schedule_background_refresh.assert_called_once_with()
+
+
+def test_snapshot_of_empty_cache_marks_every_section_stale(service, snapshot_client):
+    service._schedule_background_refresh = Mock(return_value=True)
+    with patch.object(dashboard_refresh, "advanced_cache") as cache:
+        cache.get_many.return_value = {}
+
+        response = snapshot_client.get("/super-admin/dashboard/manage/snapshot")
+
+    body = response.json()
+    assert set(body["stale_sections"]) == set(dashboard_refresh.SECTION_MAX_STALENESS)
+    assert body["staleness_seconds"] is None
+    assert body["last_refresh"] is None
+    assert body["refresh_scheduled"] is True
+
+
+def test_snapshot_requires_super_admin():
+    app = FastAPI()
+    app.include_router(dashboard_management.router)
+    app.dependency_overrides[get_current_user_compatible] = lambda: Mock(role=UserRole.STAFF)
+
+    response = TestClient(app).get("/super-admin/dashboard/manage/snapshot")
+
+    assert response.status_code == 403
+
+
+def test_background_refresh_is_scheduled_once_while_running(service):
+    started = []
+
+    async def slow_refresh():
+        started.append(True)
+        await asyncio.sleep(0.05)
+
+    service._refresh_with_own_session = slow_refresh
+
+    async def exercise():
+        first = service._schedule_background_refresh()
+        second = service._schedule_background_refresh()
+        await service._background_refresh
+        third = service._schedule_background_refresh()
+        await service._background_refresh
+        return first, second, third
+
+    assert asyncio.run(exercise()) == (True, False, True)
+    assert len(started) == 2
+
+
+def test_snapshot_query_only_reads_the_view(service):
+    conn = AsyncMock()
+    conn.execute.return_value = Mock(**{"mappings.return_value.one.return_value": {
+        "snapshot_id": 1, "total_users": 3
+    }})
+
+    snapshot = asyncio.run(service._query_snapshot(conn, datetime.now()))
+
+    assert snapshot == {"total_users": 3}
+    (statement,), _ = conn.execute.call_args
+    assert conn.execute.call_count == 1
+    assert str(statement) == f"SELECT * FROM {dashboard_refresh.DASHBOARD_SNAPSHOT_VIEW}"
+
+
+def test_snapshot_query_falls_back_inline_without_the_view(service):
+    conn = AsyncMock()
+    conn.execute.side_effect = dashboard_refresh.DBAPIError("SELECT", {}, Exception("no view"))
+    service._query_snapshot_inline = AsyncMock(return_value={"total_users": 3})
+
+    assert asyncio.run(service._query_snapshot(conn, datetime.now())) == {"total_users": 3}
+    service._query_snapshot_inline.assert_awaited_once()
@@ -0,0 +1,58 @@
+"""
+Tests for the shared database maintenance helpers.
+"""
+
+import pytest
+from sqlalchemy import Boolean, Column, Integer, create_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.utils import delete_in_batches
+
+Base = declarative_base()
+
+
+class Row(Base):
+    __tablename__ = "rows"
+
+    id = Column(Integer, primary_key=True)
+    expired = Column(Boolean, nullable=False)
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session with 25 expired and 5 live rows."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.add_all([Row(expired=i < 25) for i in range(30)])
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_delete_in_batches_removes_only_matching_rows(db):
+    deleted = delete_in_batches(db, Row, Row.expired == True, batch_size=10)
+
+    assert deleted == 25
+    assert db.query(Row).count() == 5
+    assert db.query(Row).filter(Row.expired == True).count() == 0
+
+
+def test_delete_in_batches_stops_on_exact_multiple_of_batch_size(db):
+    deleted = delete_in_batches(db, Row, Row.expired == True, batch_size=5)
+
+    assert deleted == 25
+    assert db.query(Row).count() == 5
+
+
+def test_delete_in_batches_with_nothing_to_delete(db):
+    assert delete_in_batches(db, Row, Row.id < 0, batch_size=10) == 0
+    assert db.query(Row).count() == 30
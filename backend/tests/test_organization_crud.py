@@ -0,0 +1,57 @@
+"""
+Tests for the organization CRUD service.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base import Base
+from app.models.organization import Organization
+from app.services.organization_crud import OrganizationCRUDService
+
+
+@pytest.fixture
+def db():
+    """In-memory SQLite session without the sound package table, so package inserts fail."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine, tables=[Organization.__table__])
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine, tables=[Organization.__table__])
+        engine.dispose()
+
+
+def test_failed_default_packages_do_not_roll_back_the_organization(db):
+    org = Organization(name="Acme", primary_contact_email="ops@acme.test")
+    db.add(org)
+    db.flush()
+
+    OrganizationCRUDService(db)._create_default_sound_packages(str(org.id))
+    db.commit()
+
+    assert db.query(Organization).filter(Organization.name == "Acme").count() == 1
+
+
+def test_default_packages_are_added_inside_a_savepoint():
+    db = MagicMock()
+    added_in_savepoint = []
+    db.add.side_effect = lambda obj: added_in_savepoint.append(
+        db.begin_nested.return_value.__enter__.called
+        and not db.begin_nested.return_value.__exit__.called
+    )
+
+    OrganizationCRUDService(db)._create_default_sound_packages("org-1")
+
+    db.begin_nested.assert_called_once_with()
+    assert added_in_savepoint == [True]
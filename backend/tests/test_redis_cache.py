@@ -0,0 +1,225 @@
+"""
+Tests for the RedisClient helpers, run against a small in-memory stand-in for redis.Redis.
+"""
+
+import pytest
+
+from app.core.cache import redis_client
+
+
+class FakeRedis:
+    """The subset of redis.Redis (decode_responses=True) used by RedisClient."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.calls = []
+
+    @staticmethod
+    def _decode(value):
+        return value.decode() if isinstance(value, bytes) else str(value)
+
+    def get(self, key):
+        value = self.data.get(key)
+        return value if isinstance(value, str) else None
+
+    def mget(self, keys):
+        self.calls.append(("mget", tuple(keys)))
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = self._decode(value)
+        if ex:
+            self.ttls[key] = ex
+        return True
+
+    def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            if self.data.pop(key, None) is not None:
+                removed += 1
+            self.ttls.pop(key, None)
+        return removed
+
+    def unlink(self, *keys):
+        self.calls.append(("unlink", keys))
+        return self.delete(*keys)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return key in self.data
+
+    def hincrby(self, key, field, amount):
+        fields = self.data.setdefault(key, {})
+        fields[field] = str(int(fields.get(field, 0)) + amount)
+        return int(fields[field])
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def eval(self, script, numkeys, *args):
+        # Only the compare-and-delete script is used by RedisClient
+        key, value = args
+        if self.data.get(key) == value:
+            return self.delete(key)
+        return 0
+
+    def pipeline(self, transaction=True):
+        self.calls.append(("pipeline", transaction))
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    """Queues commands and runs them against the FakeRedis on execute()."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        results = [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "client", fake)
+    return fake
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(redis_client, "client", None)
+
+
+def test_delete_if_equals_releases_only_matching_value(fake_redis):
+    fake_redis.set("lock", "token-a")
+
+    assert redis_client.delete_if_equals("lock", "token-b") is False
+    assert fake_redis.get("lock") == "token-a"
+
+    assert redis_client.delete_if_equals("lock", "token-a") is True
+    assert fake_redis.get("lock") is None
+
+
+def test_delete_if_equals_on_missing_key(fake_redis):
+    assert redis_client.delete_if_equals("lock", "token-a") is False
+
+
+def test_delete_if_equals_without_redis(no_redis):
+    assert redis_client.delete_if_equals("lock", "token-a") is False
+
+
+def test_hincrby_many_increments_fields_in_one_pipeline(fake_redis):
+    assert redis_client.hincrby_many("stats", {"hits": 1, "misses": 2}) is True
+    assert redis_client.hincrby_many("stats", {"hits": 3}) is True
+
+    assert fake_redis.hgetall("stats") == {"hits": "4", "misses": "2"}
+    assert fake_redis.calls == [("pipeline", False), ("pipeline", False)]
+
+
+def test_pop_hash_returns_fields_and_deletes_the_hash(fake_redis):
+    redis_client.hincrby_many("stats", {"hits": 5, "writes": 1})
+
+    assert redis_client.pop_hash("stats") == {"hits": "5", "writes": "1"}
+    assert redis_client.pop_hash("stats") == {}
+    assert "stats" not in fake_redis.data
+    # Read and delete run as one MULTI/EXEC transaction
+    assert fake_redis.calls[-1] == ("pipeline", True)
+
+
+def test_hash_helpers_without_redis(no_redis):
+    assert redis_client.hincrby_many("stats", {"hits": 1}) is False
+    assert redis_client.pop_hash("stats") is None
+
+
+def test_set_nx_only_sets_missing_keys(fake_redis):
+    assert redis_client.set_nx("lock", "token-a", expire=30) is True
+    assert redis_client.set_nx("lock", "token-b", expire=30) is False
+
+    assert fake_redis.get("lock") == "token-a"
+    assert fake_redis.ttls["lock"] == 30
+
+
+def test_set_nx_without_redis_is_unknown(no_redis):
+    # None rather than False, so callers can tell "taken" from "Redis down"
+    assert redis_client.set_nx("lock", "token-a") is None
+
+
+def test_set_json_many_writes_each_value_with_its_own_ttl(fake_redis):
+    assert redis_client.set_json_many({
+        "section:a": ({"count": 1}, 60),
+        "section:b": ([1, 2], None),
+    }) is True
+
+    assert redis_client.get_json("section:a") == {"count": 1}
+    assert redis_client.get_json("section:b") == [1, 2]
+    assert fake_redis.ttls == {"section:a": 60}
+    assert fake_redis.calls == [("pipeline", False)]
+
+
+def test_set_json_many_without_redis(no_redis):
+    assert redis_client.set_json_many({"section:a": ({"count": 1}, 60)}) is False
+
+
+def test_incr_counts_atomically_and_refreshes_expiry(fake_redis):
+    assert redis_client.incr("refresh_count", expire=86400) == 1
+    assert redis_client.incr("refresh_count", expire=86400) == 2
+
+    assert fake_redis.ttls["refresh_count"] == 86400
+    assert fake_redis.calls == [("pipeline", False), ("pipeline", False)]
+
+
+def test_incr_without_expire_leaves_ttl_alone(fake_redis):
+    assert redis_client.incr("refresh_count") == 1
+    assert "refresh_count" not in fake_redis.ttls
+
+
+def test_incr_without_redis(no_redis):
+    assert redis_client.incr("refresh_count", expire=60) is None
+
+
+def test_get_json_many_returns_values_in_key_order(fake_redis):
+    redis_client.set_json("section:a", {"count": 1})
+    fake_redis.set("section:broken", "{not json")
+
+    assert redis_client.get_json_many(["section:missing", "section:a", "section:broken"]) == [
+        None, {"count": 1}, None
+    ]
+    assert fake_redis.calls == [("mget", ("section:missing", "section:a", "section:broken"))]
+
+
+def test_get_json_many_without_redis(no_redis):
+    assert redis_client.get_json_many(["section:a", "section:b"]) == [None, None]
+
+
+def test_unlink_many_removes_keys_in_one_call(fake_redis):
+    fake_redis.set("section:a", "1")
+    fake_redis.set("section:b", "2")
+
+    assert redis_client.unlink_many(["section:a", "section:b", "section:missing"]) == 2
+    assert fake_redis.data == {}
+    assert fake_redis.calls == [("unlink", ("section:a", "section:b", "section:missing"))]
+
+
+def test_unlink_many_with_no_keys_skips_redis(fake_redis):
+    assert redis_client.unlink_many([]) == 0
+    assert fake_redis.calls == []
+
+
+def test_unlink_many_without_redis(no_redis):
+    assert redis_client.unlink_many(["section:a"]) == 0
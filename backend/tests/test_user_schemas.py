@@ -0,0 +1,46 @@
+"""
+Tests for the unified user schemas.
+"""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.schemas.user_unified import UserPreferencesResponseSchema, UserPreferencesSchema
+
+
+def test_preferences_round_trip_keeps_unknown_keys():
+    payload = {
+        "theme_preferences": {"theme": "dark", "font_size": "large"},
+        "audio_preferences": {"default_volume": 70, "equalizer": {"bass": 3}},
+        "notification_preferences": {"email": True, "quiet_hours": "22:00-07:00"},
+        "privacy_settings": {"share_usage": False, "retention_days": 30},
+    }
+
+    saved = UserPreferencesSchema(**payload).model_dump()
+
+    for field, value in payload.items():
+        assert saved[field] == value
+    assert UserPreferencesSchema(**saved).model_dump() == saved
+
+
+def test_stored_preferences_with_non_bool_values_are_readable():
+    now = datetime.utcnow()
+    row = SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=1,
+        created_at=now,
+        updated_at=now,
+        preferred_session_length=20,
+        preferred_time_of_day="evening",
+        notification_preferences={"digest": "weekly"},
+        theme_preferences={"theme": "light", "animations": "reduced"},
+        audio_preferences={"preferred_quality": "high"},
+        privacy_settings={"analytics": None},
+    )
+
+    response = UserPreferencesResponseSchema.model_validate(row)
+
+    assert response.notification_preferences == {"digest": "weekly"}
+    assert response.theme_preferences == {"theme": "light", "animations": "reduced"}
+    assert response.privacy_settings == {"analytics": None}
@@ -67,6 +67,20 @@ const AdminDashboard = () => {
           });
         }
         break;
+      case 'data_refresh':
+      case 'data_refresh_delta': {
+        // A full refresh carries every section, a delta only the changed ones
+        const sections = (type === 'data_refresh' ? payload : data.changes) || {};
+        setDashboardData(prev => ({
+          ...prev,
+          ...(sections.platform_stats && { platformStats: sections.platform_stats }),
+          ...(sections.revenue_analytics && { revenueAnalytics: sections.revenue_analytics }),
+          ...(sections.growth_trends && { growthTrends: sections.growth_trends }),
+          ...(sections.system_health && { systemHealth: sections.system_health })
+        }));
+        setLastUpdated(new Date());
+        break;
+      }
       case 'user_activity':
         if (payload.user_data) {
           setUserActivity(prev => [payload.user_data, ...prev.slice(0, 49)]);
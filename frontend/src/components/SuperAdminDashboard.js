@@ -77,6 +77,14 @@ const SuperAdminDashboard = () => {
     }
   }, []);
 
+  // Apply dashboard sections pushed by the server-side refresh
+  const applyDashboardSections = (sections = {}) => {
+    if (sections.platform_stats) setPlatformStats(sections.platform_stats);
+    if (sections.revenue_analytics) setRevenueAnalytics(sections.revenue_analytics);
+    if (sections.growth_trends) setGrowthTrends(sections.growth_trends);
+    if (sections.system_health) setSystemHealth(sections.system_health);
+  };
+
   // Handle real-time data updates from WebSocket
   const handleRealTimeUpdate = useCallback((data) => {
     const { type, payload } = data;
@@ -100,6 +108,14 @@ const SuperAdminDashboard = () => {
       case 'full_refresh':
         loadAllDashboardData();
         break;
+      case 'data_refresh':
+        // Every cached dashboard section, sent on connect and after the first refresh
+        applyDashboardSections(data.data);
+        break;
+      case 'data_refresh_delta':
+        // Only the sections that changed since the previous refresh
+        applyDashboardSections(data.changes);
+        break;
       default:
         console.log('Unknown real-time update type:', type);
     }